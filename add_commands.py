@@ -2,10 +2,17 @@
 Add missing slash commands to main.py
 """
 
-import re
+import ast
 
-# Read main.py
-with open('main.py', 'r', encoding='utf-8') as f:
+SETUP_CALL = 'self.tree.add_command(self.slash_cmds.earnings)'
+NEW_SETUP_CALLS = (
+    'self.tree.add_command(self.slash_cmds.alert)',
+    'self.tree.add_command(self.slash_cmds.alerts)',
+    'self.tree.add_command(self.slash_cmds.report)',
+)
+
+# Read main.py as raw bytes; ast.parse honours the source encoding itself
+with open('main.py', 'rb') as f:
     content = f.read()
 
 # Find the SlashCommands class and add new commands after the last one (earnings)
@@ -70,7 +77,7 @@ new_commands = '''
                 emoji = "📈" if direction == "above" else "📉"
                 embed.add_field(
                     name=f"{emoji} ${ticker}",
-                    value=f"{direction}} ${target:.2f}",
+                    value=f"{direction} ${target:.2f}",
                     inline=True
                 )
         
@@ -120,31 +127,53 @@ new_commands = '''
             await interaction.followup.send(f"❌ Error: {str(e)[:200]}", ephemeral=True)
 '''
 
-# Find the last command in SlashCommands class and add new ones after it
-# The last command is @app_commands.command(name="earnings"...)
-# Find the earnings command and add after its async def
 
-# Find position after earnings command
-earnings_pattern = r'(@app_commands\.command\(name="earnings".*?async def earnings\(self, interaction: discord\.Interaction\):.*?await interaction\.followup\.send\(f"❌ Error:.*?\)'
-match = re.search(earnings_pattern, content, re.DOTALL)
+def find_insert_points(tree):
+    """
+    Locate the splice points in main.py's syntax tree
+
+    Returns:
+        (earnings_end_line, setup_call_node) - either may be None
+    """
+    earnings_end = None
+    setup_call = None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name == 'SlashCommands':
+            for item in node.body:
+                if isinstance(item, ast.AsyncFunctionDef) and item.name == 'earnings':
+                    earnings_end = item.end_lineno
+        elif isinstance(node, ast.Expr) and ast.unparse(node) == SETUP_CALL:
+            setup_call = node
+    return earnings_end, setup_call
+
+
+# Parse once and splice at statement boundaries - no regex, whitespace-proof
+# Guard against running twice - main.py is patched in place
+already_added = b'name="alert"' in content
+earnings_end = setup_call = None
+if not already_added:
+    earnings_end, setup_call = find_insert_points(ast.parse(content))
 
-if match:
-    end_pos = match.end()
-    content = content[:end_pos] + new_commands + content[end_pos:]
+if already_added:
+    print("✅ /alert, /alerts, and /report commands are already in main.py")
+elif earnings_end and setup_call and setup_call.lineno > earnings_end:
+    lines = content.splitlines(keepends=True)
+    indent = b' ' * setup_call.col_offset
+    setup_lines = b''.join(indent + call.encode('utf-8') + b'\n' for call in NEW_SETUP_CALLS)
     
-    # Now also add the new commands to setup_hook
-    # Find self.tree.add_command for earnings and add our new ones after
-    setup_pattern = r'(self\.tree\.add_command\(self\.slash_cmds\.earnings\))'
-    content = re.sub(setup_pattern, 
-                    r'''\1
-        self.tree.add_command(self.slash_cmds.alert)
-        self.tree.add_command(self.slash_cmds.alerts)
-        self.tree.add_command(self.slash_cmds.report)''',
-                    content)
+    # The new commands go after earnings, the setup_hook calls after the
+    # earnings add_command (setup_hook lives after SlashCommands)
+    parts = lines[:earnings_end]
+    parts.append(new_commands.encode('utf-8'))
+    parts.extend(lines[earnings_end:setup_call.end_lineno])
+    parts.append(setup_lines)
+    parts.extend(lines[setup_call.end_lineno:])
     
     # Write the updated content
-    with open('main.py', 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Hand the whole file to a single buffered write
+    data = b"".join(parts)
+    with open('main.py', 'wb', buffering=1 << 20) as f:
+        f.write(data)
     print("✅ Successfully added /alert, /alerts, and /report commands!")
 else:
     print("❌ Could not find earnings command to add after")
@@ -2,8 +2,186 @@
 AI Summary Generator - Provides trading recommendations based on analysis
 """
 
-from typing import Dict, List, Optional
-from datetime import datetime
+import bisect
+import functools
+import operator
+import sys
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+
+# Fixed vocabularies, interned so equality checks and dict lookups hit the
+# identity fast path even when the values arrive from JSON/network payloads
+_ACTIONS = {k: sys.intern(k) for k in ('STRONG_BUY', 'BUY', 'HOLD', 'SELL', 'AVOID')}
+_SIGNALS = {k: sys.intern(k) for k in ('BULLISH', 'BEARISH', 'NEUTRAL')}
+
+# Scoring tables for _feature_components: (compare, threshold, delta, reason template).
+# Bands are checked in order and the first match wins.
+_MOMENTUM_BANDS = (
+    (operator.ge, 75, 25, "🚀 Strong bullish momentum (%s/100)"),
+    (operator.ge, 60, 15, "📈 Bullish momentum (%s/100)"),
+    (operator.le, 30, -20, "📉 Weak momentum (%s/100)"),
+)
+_RISK_REWARD_BANDS = (
+    (operator.ge, 3, 20, "💎 Excellent R/R (%.1f:1)"),
+    (operator.ge, 2, 15, "✅ Good R/R (%.1f:1)"),
+    (operator.lt, 1, -15, "⚠️ Poor R/R (%.1f:1)"),
+)
+# Substring of risk_level -> (delta, reason); 'VERY HIGH' must precede 'HIGH'
+_RISK_LEVELS = (
+    ('VERY HIGH', -15, "🔴 Very high risk profile"),
+    ('HIGH', -10, "🟠 High risk profile"),
+    ('LOW', 10, "🟢 Low risk profile"),
+)
+_TECH_SIGNALS = {
+    _SIGNALS['BULLISH']: (20, "✅ Bullish technical signals"),
+    _SIGNALS['BEARISH']: (-15, "⚠️ Bearish technical signals"),
+}
+# Only applied when sentiment confidence > 0.7; formatted with confidence * 100
+_SENTIMENT_SIGNALS = {
+    _SIGNALS['BULLISH']: (10, "💬 Strong bullish sentiment (%.0f%%)"),
+    _SIGNALS['BEARISH']: (-10, "💬 Strong bearish sentiment (%.0f%%)"),
+}
+_STRONG_BACKTEST_TMPL = "📊 Strong historical performance (Sharpe: %.2f)"
+_WEAK_BACKTEST_TMPL = "⚠️ Weak historical performance (Sharpe: %.2f)"
+_ALERTS_TMPL = "🎯 %d actionable alert(s)"
+# Embed line templates for format_recommendations_embed
+_PRICED_LINE = "%(emoji)s **$%(ticker)s** ($%(price).2f)\n   %(reasons)s"
+_AVOID_LINE = "%(emoji)s **$%(ticker)s** - %(reasons)s"
+# Fixed reasons carry no args and are used verbatim, skipping formatting
+_NO_ARGS = ()
+
+# Action buckets by score: bisect_right over the thresholds yields an index
+# into _ACTIONS_TABLE
+_ACTION_THRESHOLDS = (-40, -20, 35, 60)
+_ACTIONS_TABLE = (
+    (_ACTIONS['AVOID'], '🔴'),
+    (_ACTIONS['SELL'], '🟠'),
+    (_ACTIONS['HOLD'], '🟡'),
+    (_ACTIONS['BUY'], '🟢'),
+    (_ACTIONS['STRONG_BUY'], '🟢'),
+)
+# Recommendation key and how many of each bucket are kept, by bucket index
+_BUCKET_OUTPUT = (('avoid', 3), ('sells', 3), ('holds', 3), ('buys', 5), ('strong_buys', 5))
+
+
+def _match_band(value, bands):
+    """Return (delta, template) of the first band value falls in, else None"""
+    for compare, threshold, delta, template in bands:
+        if compare(value, threshold):
+            return delta, template
+    return None
+
+
+def _stock_features(stock_data: Dict) -> tuple:
+    """
+    Pull everything the scoring looks at out of one stock's data
+    
+    Returns:
+        Hashable (momentum score, technical signal, R/R ratio,
+        (sharpe, total return), risk level, actionable alert count,
+        (sentiment, confidence)) fingerprint. None marks a missing section.
+    """
+    sg = stock_data.get
+    
+    momentum = sg('momentum')
+    mom_score = momentum.get('score', 50) if momentum else None
+    
+    signal = None
+    tech_analysis = sg('technical_analysis')
+    if tech_analysis:
+        signal = tech_analysis.get('signal', 'NEUTRAL')
+        if isinstance(signal, str):
+            signal = sys.intern(signal)
+    
+    risk_reward = sg('risk_reward')
+    ratio = risk_reward.get('ratio', 0) if risk_reward else None
+    
+    backtest = sg('backtest')
+    if backtest:
+        backtest = (backtest.get('sharpe_ratio', 0), backtest.get('total_return', 0))
+    else:
+        backtest = None
+    
+    risk_assessment = sg('risk_assessment')
+    risk_level = risk_assessment.get('risk_level', '') if risk_assessment else None
+    
+    alerts = sg('price_alerts') or ()
+    n_actionable = sum(1 for a in alerts if isinstance(a, dict) and a.get('actionable'))
+    
+    sentiment = sg('sentiment')
+    if sentiment:
+        sent_text = sentiment.get('sentiment', 'NEUTRAL')
+        if isinstance(sent_text, str):
+            sent_text = sys.intern(sent_text)
+        sentiment = (sent_text, sentiment.get('confidence', 0))
+    else:
+        sentiment = None
+    
+    return (mom_score, signal, ratio, backtest, risk_level, n_actionable, sentiment)
+
+
+def _feature_components(features: tuple) -> List[Tuple[int, str, tuple]]:
+    """Score deltas and unformatted reasons for a _stock_features fingerprint"""
+    mom_score, signal, ratio, backtest, risk_level, n_actionable, sentiment = features
+    components = []
+    add = components.append
+    
+    # Momentum Analysis (weight: 25%)
+    if mom_score is not None:
+        band = _match_band(mom_score, _MOMENTUM_BANDS)
+        if band:
+            add((band[0], band[1], (mom_score,)))
+    
+    # Technical Analysis (weight: 20%)
+    hit = _TECH_SIGNALS.get(signal)
+    if hit:
+        add((hit[0], hit[1], _NO_ARGS))
+    
+    # Risk/Reward (weight: 20%)
+    if ratio is not None:
+        band = _match_band(ratio, _RISK_REWARD_BANDS)
+        if band:
+            add((band[0], band[1], (ratio,)))
+    
+    # Backtest Performance (weight: 15%)
+    if backtest is not None:
+        sharpe, total_return = backtest
+        if sharpe > 1.5 and total_return > 50:
+            add((15, _STRONG_BACKTEST_TMPL, (sharpe,)))
+        elif sharpe < 0.5:
+            add((-10, _WEAK_BACKTEST_TMPL, (sharpe,)))
+    
+    # Risk Assessment (weight: 10%)
+    if risk_level is not None:
+        for marker, delta, reason in _RISK_LEVELS:
+            if marker in risk_level:
+                add((delta, reason, _NO_ARGS))
+                break
+    
+    # Actionable Alerts (weight: 10%)
+    if n_actionable:
+        add((10, _ALERTS_TMPL, (n_actionable,)))
+    
+    # Sentiment (weight: 10%)
+    if sentiment is not None:
+        sent_text, confidence = sentiment
+        hit = _SENTIMENT_SIGNALS.get(sent_text)
+        if hit and confidence > 0.7:
+            add((hit[0], hit[1], (confidence * 100,)))
+    
+    return components
+
+
+@functools.lru_cache(maxsize=4096)
+def _analyze_features(features: tuple) -> Tuple[int, Tuple[str, ...]]:
+    """Cached (score, top 5 reasons) for a _stock_features fingerprint"""
+    components = _feature_components(features)
+    return sum(delta for delta, _, _ in components), tuple(_render_reasons(components))
+
+
+def _render_reasons(components) -> List[str]:
+    """Format the top 5 reasons of a _feature_components result"""
+    return [template % args if args else template for _, template, args in components[:5]]
 
 
 class AISummaryGenerator:
@@ -16,158 +194,41 @@ class AISummaryGenerator:
         Returns:
             Dict with 'strong_buys', 'buys', 'holds', 'sells', 'avoid' lists
         """
+        now_iso = datetime.now(timezone.utc).isoformat()
         if not all_stocks_data:
-            return self._empty_recommendations()
-        
-        strong_buys = []
-        buys = []
-        holds = []
-        sells = []
-        avoid = []
+            return self._empty_recommendations(now_iso)
         
-        for stock in all_stocks_data:
-            recommendation = self._analyze_stock(stock)
-            
-            if recommendation['action'] == 'STRONG_BUY':
-                strong_buys.append(recommendation)
-            elif recommendation['action'] == 'BUY':
-                buys.append(recommendation)
-            elif recommendation['action'] == 'HOLD':
-                holds.append(recommendation)
-            elif recommendation['action'] == 'SELL':
-                sells.append(recommendation)
-            else:  # AVOID
-                avoid.append(recommendation)
+        # Scores and reasons come from the memoised _analyze_features, so a
+        # stock whose inputs haven't changed since the last call isn't rescored
+        recommendations = {key: [] for key, _ in _BUCKET_OUTPUT}
+        for stock_data in all_stocks_data:
+            score, reasons = _analyze_features(_stock_features(stock_data))
+            key, limit = _BUCKET_OUTPUT[bisect.bisect_right(_ACTION_THRESHOLDS, score)]
+            bucket = recommendations[key]
+            if len(bucket) < limit:
+                bucket.append(self._make_recommendation(stock_data, score, list(reasons)))
         
-        return {
-            'strong_buys': strong_buys[:5],  # Top 5
-            'buys': buys[:5],
-            'holds': holds[:3],
-            'sells': sells[:3],
-            'avoid': avoid[:3],
-            'generated_at': datetime.now().isoformat()
-        }
+        recommendations['generated_at'] = now_iso
+        return recommendations
     
-    def _analyze_stock(self, stock_data: Dict) -> Dict:
-        """Analyze individual stock and return recommendation"""
-        ticker = stock_data.get('ticker', 'UNKNOWN')
-        score = 0
-        reasons = []
-        
-        # Momentum Analysis (weight: 25%)
-        momentum = stock_data.get('momentum', {})
-        if momentum:
-            mom_score = momentum.get('score', 50)
-            if mom_score >= 75:
-                score += 25
-                reasons.append(f"🚀 Strong bullish momentum ({mom_score}/100)")
-            elif mom_score >= 60:
-                score += 15
-                reasons.append(f"📈 Bullish momentum ({mom_score}/100)")
-            elif mom_score <= 30:
-                score -= 20
-                reasons.append(f"📉 Weak momentum ({mom_score}/100)")
-        
-        # Technical Analysis (weight: 20%)
-        tech_analysis = stock_data.get('technical_analysis', {})
-        if tech_analysis:
-            signal = tech_analysis.get('signal', 'NEUTRAL')
-            if signal == 'BULLISH':
-                score += 20
-                reasons.append("✅ Bullish technical signals")
-            elif signal == 'BEARISH':
-                score -= 15
-                reasons.append("⚠️ Bearish technical signals")
-        
-        # Risk/Reward (weight: 20%)
-        risk_reward = stock_data.get('risk_reward')
-        if risk_reward:
-            ratio = risk_reward.get('ratio', 0)
-            if ratio >= 3:
-                score += 20
-                reasons.append(f"💎 Excellent R/R ({ratio:.1f}:1)")
-            elif ratio >= 2:
-                score += 15
-                reasons.append(f"✅ Good R/R ({ratio:.1f}:1)")
-            elif ratio < 1:
-                score -= 15
-                reasons.append(f"⚠️ Poor R/R ({ratio:.1f}:1)")
-        
-        # Backtest Performance (weight: 15%)
-        backtest = stock_data.get('backtest')
-        if backtest:
-            sharpe = backtest.get('sharpe_ratio', 0)
-            total_return = backtest.get('total_return', 0)
-            
-            if sharpe > 1.5 and total_return > 50:
-                score += 15
-                reasons.append(f"📊 Strong historical performance (Sharpe: {sharpe:.2f})")
-            elif sharpe < 0.5:
-                score -= 10
-                reasons.append(f"⚠️ Weak historical performance (Sharpe: {sharpe:.2f})")
-        
-        # Risk Assessment (weight: 10%)
-        risk_assessment = stock_data.get('risk_assessment', {})
-        if risk_assessment:
-            risk_level = risk_assessment.get('risk_level', '')
-            if 'VERY HIGH' in risk_level:
-                score -= 15
-                reasons.append("🔴 Very high risk profile")
-            elif 'HIGH' in risk_level:
-                score -= 10
-                reasons.append("🟠 High risk profile")
-            elif 'LOW' in risk_level:
-                score += 10
-                reasons.append("🟢 Low risk profile")
-        
-        # Actionable Alerts (weight: 10%)
-        alerts = stock_data.get('price_alerts', [])
-        actionable_alerts = [a for a in alerts if isinstance(a, dict) and a.get('actionable')]
-        if actionable_alerts:
-            score += 10
-            reasons.append(f"🎯 {len(actionable_alerts)} actionable alert(s)")
-        
-        # Sentiment (weight: 10%)
-        sentiment = stock_data.get('sentiment', {})
-        if sentiment:
-            sent_text = sentiment.get('sentiment', 'NEUTRAL')
-            confidence = sentiment.get('confidence', 0)
-            if sent_text == 'BULLISH' and confidence > 0.7:
-                score += 10
-                reasons.append(f"💬 Strong bullish sentiment ({confidence:.0%})")
-            elif sent_text == 'BEARISH' and confidence > 0.7:
-                score -= 10
-                reasons.append(f"💬 Strong bearish sentiment ({confidence:.0%})")
-        
-        # Determine action based on score
-        if score >= 60:
-            action = 'STRONG_BUY'
-            emoji = '🟢'
-        elif score >= 35:
-            action = 'BUY'
-            emoji = '🟢'
-        elif score >= -20:
-            action = 'HOLD'
-            emoji = '🟡'
-        elif score >= -40:
-            action = 'SELL'
-            emoji = '🟠'
-        else:
-            action = 'AVOID'
-            emoji = '🔴'
+    def _make_recommendation(self, stock_data: Dict, score: int, reasons: List[str]) -> Dict:
+        """Assemble the recommendation dict for an already-scored stock"""
+        sg = stock_data.get
+        ticker = sg('ticker', 'UNKNOWN')
+        action, emoji = _ACTIONS_TABLE[bisect.bisect_right(_ACTION_THRESHOLDS, score)]
         
         return {
             'ticker': ticker,
-            'name': stock_data.get('name', ticker),
+            'name': sg('name', ticker),
             'action': action,
             'emoji': emoji,
             'score': score,
-            'reasons': reasons[:5],  # Top 5 reasons
-            'price': stock_data.get('price'),
-            'market_cap': stock_data.get('market_cap')
+            'reasons': reasons,
+            'price': sg('price'),
+            'market_cap': sg('market_cap')
         }
     
-    def _empty_recommendations(self) -> Dict:
+    def _empty_recommendations(self, generated_at: Optional[str] = None) -> Dict:
         """Return empty recommendations"""
         return {
             'strong_buys': [],
@@ -175,67 +236,60 @@ class AISummaryGenerator:
             'holds': [],
             'sells': [],
             'avoid': [],
-            'generated_at': datetime.now().isoformat()
+            'generated_at': generated_at or datetime.now(timezone.utc).isoformat()
         }
     
     def format_recommendations_embed(self, recommendations: Dict) -> Dict:
         """Format recommendations as Discord embed"""
-        if not any([recommendations['strong_buys'], recommendations['buys'], 
-                   recommendations['holds'], recommendations['sells'], recommendations['avoid']]):
+        if not (recommendations['strong_buys'] or recommendations['buys'] or
+                recommendations['holds'] or recommendations['sells'] or recommendations['avoid']):
             return None
         
         fields = []
+        fields_append = fields.append
         
         # Strong Buys
         if recommendations['strong_buys']:
-            strong_buy_lines = []
-            for rec in recommendations['strong_buys']:
-                reasons_str = " • ".join(rec['reasons'][:2])  # Top 2 reasons
-                strong_buy_lines.append(
-                    f"{rec['emoji']} **${rec['ticker']}** (${rec['price']:.2f})\n   {reasons_str}"
-                )
-            
-            fields.append({
-                "name": "🚀 STRONG BUYS - High Conviction Plays",
-                "value": "\n\n".join(strong_buy_lines),
-                "inline": False
-            })
+            fields_append(self._recommendation_field(
+                "🚀 STRONG BUYS - High Conviction Plays", recommendations['strong_buys'],
+                _PRICED_LINE, "\n\n"
+            ))
         
         # Buys
         if recommendations['buys']:
-            buy_lines = []
-            for rec in recommendations['buys']:
-                reasons_str = " • ".join(rec['reasons'][:2])
-                buy_lines.append(
-                    f"{rec['emoji']} **${rec['ticker']}** (${rec['price']:.2f})\n   {reasons_str}"
-                )
-            
-            fields.append({
-                "name": "✅ BUYS - Solid Opportunities",
-                "value": "\n\n".join(buy_lines),
-                "inline": False
-            })
+            fields_append(self._recommendation_field(
+                "✅ BUYS - Solid Opportunities", recommendations['buys'],
+                _PRICED_LINE, "\n\n"
+            ))
         
         # Avoid
         if recommendations['avoid']:
-            avoid_lines = []
-            for rec in recommendations['avoid']:
-                reasons_str = " • ".join(rec['reasons'][:2])
-                avoid_lines.append(
-                    f"{rec['emoji']} **${rec['ticker']}** - {reasons_str}"
-                )
-            
-            fields.append({
-                "name": "⚠️ AVOID - High Risk / Poor Setup",
-                "value": "\n".join(avoid_lines),
-                "inline": False
-            })
+            fields_append(self._recommendation_field(
+                "⚠️ AVOID - High Risk / Poor Setup", recommendations['avoid'],
+                _AVOID_LINE, "\n"
+            ))
         
         return {
             "title": "🤖 AI Trading Recommendations",
             "description": "Algorithmic analysis of Reddit DD picks with risk-adjusted scoring",
             "color": 0x00FF00,
             "fields": fields,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": recommendations.get('generated_at') or datetime.now(timezone.utc).isoformat(),
             "footer": {"text": "💎 Turd News Network AI • Scores based on momentum, technicals, risk/reward, backtest, sentiment"}
         }
+    
+    def _recommendation_field(self, name: str, recs: List[Dict], line_format: str, separator: str) -> Dict:
+        """Build one embed field listing recommendations with their top 2 reasons"""
+        value = separator.join(
+            line_format % {
+                'emoji': rec['emoji'], 'ticker': rec['ticker'], 'price': rec['price'],
+                'reasons': " • ".join(rec['reasons'][:2]),  # Top 2 reasons
+            }
+            for rec in recs
+        )
+        
+        return {
+            "name": name,
+            "value": value,
+            "inline": False
+        }
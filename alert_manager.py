@@ -4,22 +4,109 @@ Integrates with existing sentiment analyzer, stock data fetcher, and Reddit scra
 """
 
 import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 import asyncio
+import collections
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
 import aiohttp
+import numpy as np
 from dataclasses import dataclass
 from enum import Enum
 
 from config import (
     NEWS_SOURCES,
     SUBREDDITS,
-    STOCK_CONFIG
+    STOCK_CONFIG,
+    USER_AGENT
 )
 from sentiment import SentimentAnalyzer
 from stock_data import StockDataFetcher
 from scraper import RedditScraper
 
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
+
+# Responses worth retrying: rate limiting and transient server errors
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+# orjson is optional; it encodes embed payloads several times faster than json
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Numba is optional; without it the NumPy path below is used for every watchlist
+_numba_available = False
+try:
+    from numba import njit, prange
+    _numba_available = True
+except ImportError:
+    pass
+
+# Below this many tickers NumPy's dispatch overhead is cheaper than thread fan-out
+_JIT_MIN_ROWS = 10000
+
+if _numba_available:
+    @njit(cache=True, parallel=True, error_model='numpy')
+    def _alert_masks_jit(close, prev, vol, avg_vol, open_, volume_threshold, change_threshold):
+        n = close.shape[0]
+        volume_mask = np.empty(n, dtype=np.bool_)
+        price_mask = np.empty(n, dtype=np.bool_)
+        gap_mask = np.empty(n, dtype=np.bool_)
+        for i in prange(n):
+            volume_mask[i] = vol[i] / avg_vol[i] >= volume_threshold
+            price_mask[i] = abs(close[i] - prev[i]) / prev[i] >= change_threshold
+            gap_mask[i] = abs(open_[i] - prev[i]) / prev[i] >= change_threshold
+        return volume_mask, price_mask, gap_mask
+
+
+def _alert_masks(close, prev, vol, avg_vol, open_, volume_threshold, change_threshold):
+    """
+    Vector form of the volume / price change / gap checks over a watchlist
+    
+    Returns:
+        (volume_mask, price_mask, gap_mask) boolean arrays
+    """
+    if _numba_available and close.shape[0] >= _JIT_MIN_ROWS:
+        return _alert_masks_jit(close, prev, vol, avg_vol, open_, volume_threshold, change_threshold)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_mask = vol / avg_vol >= volume_threshold
+        price_mask = np.abs(close - prev) / prev >= change_threshold
+        gap_mask = np.abs(open_ - prev) / prev >= change_threshold
+    return volume_mask, price_mask, gap_mask
+
+
+class _RateLimiter:
+    """Async token bucket: at most `rate` acquisitions per `period` seconds"""
+    
+    def __init__(self, rate: float, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
 
 class AlertType(Enum):
     """Types of alerts that can be generated"""
@@ -32,7 +119,46 @@ class AlertType(Enum):
     GAP_DOWN = "gap_down"
 
 
-@dataclass
+# Alert type groupings used by the sentiment filter and embed colouring
+_BULLISH_TYPES = frozenset({AlertType.BREAKOUT, AlertType.GAP_UP})
+_BEARISH_TYPES = frozenset({AlertType.DROP, AlertType.GAP_DOWN})
+_COLOR_BY_TYPE = {
+    AlertType.BREAKOUT: 5763719,  # Green
+    AlertType.GAP_UP: 5763719,
+    AlertType.DROP: 15548997,  # Red
+    AlertType.GAP_DOWN: 15548997,
+}
+_DEFAULT_COLOR = 16776960  # Yellow
+_EMOJI_BY_TYPE = {
+    AlertType.UNUSUAL_VOLUME: "📊",
+    AlertType.BREAKOUT: "🚀",
+    AlertType.DROP: "📉",
+    AlertType.GAP_UP: "⬆️",
+    AlertType.GAP_DOWN: "⬇️",
+}
+_DEFAULT_EMOJI = "⚠️"
+
+# Detail keys rendered as link lists rather than inline fields
+_LINK_DETAIL_KEYS = frozenset({'news_articles', 'reddit_posts'})
+
+# snake_case key -> embed field name; alerts reuse a handful of detail keys
+_FIELD_NAME_CACHE: Dict[str, str] = {}
+
+
+def _pretty(key: str) -> str:
+    """Embed field name for a snake_case key, e.g. volume_ratio -> Volume Ratio"""
+    name = _FIELD_NAME_CACHE.get(key)
+    if name is None:
+        name = _FIELD_NAME_CACHE[key] = key.replace("_", " ").title()
+    return name
+
+
+def _price_cache_key(ticker: str) -> str:
+    """response_cache key for a ticker's 5-day daily bars"""
+    return f"{ticker}:5d:1d"
+
+
+@dataclass(slots=True)
 class Alert:
     """Represents a stock alert"""
     ticker: str
@@ -69,90 +195,321 @@ class AlertManager:
         self.price_change_threshold = 0.05  # 5% price change
         self.sentiment_threshold = 0.6  # 60% confidence
         
-        # Track alerts to avoid duplicates
-        self.recent_alerts = {}
+        # Track alerts to avoid duplicates (key -> monotonic ns when sent);
+        # kept in send order so expired entries can be popped off the front
+        self.recent_alerts: collections.OrderedDict = collections.OrderedDict()
+        self.recent_alerts_max = 10000
         self.alert_cooldown = timedelta(minutes=30)
+        self._cooldown_ns = int(self.alert_cooldown.total_seconds() * 1e9)
+        
+        # Bound how many tickers scan_for_alerts checks at once
+        self._scan_sem = asyncio.Semaphore(STOCK_CONFIG.get('max_concurrent', 32))
+        
+        # Shared aiohttp session for Yahoo and Discord (see _get_http)
+        self._http: Optional[aiohttp.ClientSession] = None
+        
+        # Per-host request budgets; Yahoo starts returning 429s well before
+        # a full concurrent scan would otherwise finish
+        self._limiters = {'query1.finance.yahoo.com': _RateLimiter(30, 1)}
+        self._max_retries = 3
+        
+        # ticker -> (monotonic fetch time, stock data); daily bars barely move
+        # between back-to-back scans, so reuse them for _price_ttl seconds
+        self._price_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._price_ttl = 60.0
+        self._news_ttl = 900.0
+        
+        # ticker -> monotonic ns of its last completed scan; rescanning inside
+        # the price TTL would only replay cached bars
+        self._last_scan_ns: Dict[str, int] = {}
+        self._scan_interval_ns = int(self._price_ttl * 1e9)
+        
+        # Headline -> sentiment score (LRU); the same market-wide headlines
+        # show up across tickers and scans
+        self._sentiment_cache: collections.OrderedDict = collections.OrderedDict()
+        self._sentiment_cache_size = 4096
     
-    async def check_alerts(self, ticker: str, data: Optional[Dict] = None) -> List[Alert]:
+    async def check_alerts(self, ticker: str, data: Optional[Dict] = None,
+                           checks: Optional[Tuple[bool, bool, bool]] = None) -> List[Alert]:
         """
         Check for alerts for a given ticker
         
         Args:
             ticker: Stock ticker symbol
             data: Optional pre-fetched stock data
+            checks: Optional precomputed (volume, price change, gap) check results
             
         Returns:
             List of alerts found
         """
         alerts = []
         
-        try:
-            # Fetch stock data if not provided
-            if data is None:
-                data = await self._fetch_stock_data(ticker)
-                if not data:
-                    return alerts
-            
-            # Check for different alert types
-            if self._check_volume_alert(data):
-                alert = await self._create_volume_alert(ticker, data)
-                if alert:
-                    alerts.append(alert)
-            
-            if self._check_price_change_alert(data):
-                alert = await self._create_price_change_alert(ticker, data)
-                if alert:
-                    alerts.append(alert)
-            
-            if self._check_gap_alert(data):
-                alert = await self._create_gap_alert(ticker, data)
-                if alert:
-                    alerts.append(alert)
-            
-            # Fetch and validate with sentiment
-            if alerts:
-                for alert in alerts:
-                    await self._validate_with_sentiment(alert)
+        async with self._scan_sem:
+            try:
+                # Fetch stock data if not provided
+                if data is None:
+                    data = await self._fetch_stock_data(ticker)
+                    if not data:
+                        return alerts
                 
-                # Filter alerts based on cooldown and sentiment
-                alerts = self._filter_alerts(alerts)
-        
-        except Exception as e:
-            print(f"[!] Error checking alerts for {ticker}: {e}")
+                # Check for different alert types
+                if checks is None:
+                    checks = (
+                        self._check_volume_alert(data),
+                        self._check_price_change_alert(data),
+                        self._check_gap_alert(data)
+                    )
+                volume_hit, price_hit, gap_hit = checks
+                
+                if volume_hit:
+                    alert = await self._create_volume_alert(ticker, data)
+                    if alert:
+                        alerts.append(alert)
+                
+                if price_hit:
+                    alert = await self._create_price_change_alert(ticker, data)
+                    if alert:
+                        alerts.append(alert)
+                
+                if gap_hit:
+                    alert = await self._create_gap_alert(ticker, data)
+                    if alert:
+                        alerts.append(alert)
+                
+                # Fetch and validate with sentiment
+                if alerts:
+                    await asyncio.gather(*(self._validate_with_sentiment(alert) for alert in alerts))
+                    
+                    # Filter alerts based on cooldown and sentiment
+                    alerts = self._filter_alerts(alerts)
+            
+            except Exception as e:
+                print(f"[!] Error checking alerts for {ticker}: {e}")
         
         return alerts
     
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, created lazily so it binds to the running loop"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=256, limit_per_host=64, ttl_dns_cache=300, keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={'User-Agent': USER_AGENT}
+            )
+        return self._http
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+    
+    async def __aenter__(self) -> 'AlertManager':
+        self._get_http()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _get_json(self, url: str, **kwargs) -> Optional[Dict]:
+        """
+        GET a JSON document under the host's rate limit, backing off on 429
+        
+        Returns:
+            Parsed JSON, or None on any non-200 response
+        """
+        limiter = self._limiters.get(urlsplit(url).hostname)
+        for attempt in range(self._max_retries + 1):
+            if limiter:
+                await limiter.acquire()
+            async with self._get_http().get(url, **kwargs) as response:
+                if response.status == 200:
+                    return await response.json()
+                if response.status != 429 or attempt == self._max_retries:
+                    return None
+                retry_after = response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else 1.0
+            await asyncio.sleep(delay * 2 ** attempt)
+        return None
+    
+    async def _post_json(self, url: str, payload: Dict) -> int:
+        """
+        POST a JSON payload, retrying rate-limit and transient server errors
+        
+        Returns:
+            Final HTTP status code
+        """
+        body = _json_dumps(payload)
+        for attempt in range(self._max_retries + 1):
+            async with self._get_http().post(url, data=body, headers=_JSON_HEADERS) as response:
+                if response.status not in _RETRY_STATUSES or attempt == self._max_retries:
+                    return response.status
+                retry_after = response.headers.get('Retry-After', '')
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = 0.3 * 2 ** attempt
+            await asyncio.sleep(delay)
+    
     async def _fetch_stock_data(self, ticker: str) -> Optional[Dict]:
         """Fetch stock data for ticker"""
+        fetched_at, cached = self._price_cache.get(ticker, (0.0, None))
+        if cached and time.monotonic() - fetched_at < self._price_ttl:
+            return cached
+        
+        # Fall back to the persistent cache so restarts don't refetch fresh data
+        disk_key = _price_cache_key(ticker)
+        entry = (await asyncio.to_thread(self.db.get_cached_responses, [disk_key])).get(disk_key)
+        if entry:
+            return self._adopt_disk_price(ticker, *entry)
+        
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="5d", interval="1d")
+            payload = await self._get_json(
+                YAHOO_CHART_URL.format(ticker=ticker),
+                params={'range': '5d', 'interval': '1d'},
+                timeout=aiohttp.ClientTimeout(total=8)
+            )
+            if payload is None:
+                return None
             
-            if hist.empty:
+            result = payload['chart']['result'][0]
+            quote = result['indicators']['quote'][0]
+            
+            # Skip bars Yahoo returns without a close (e.g. the current, unfinished day)
+            rows = [i for i, close in enumerate(quote['close']) if close is not None]
+            if not rows:
                 return None
             
-            latest = hist.iloc[-1]
-            previous = hist.iloc[-2] if len(hist) > 1 else latest
+            latest = rows[-1]
+            previous = rows[-2] if len(rows) > 1 else latest
             
             # Calculate average volume
-            avg_volume = hist['Volume'].mean()
+            avg_volume = statistics.fmean(quote['volume'][i] or 0 for i in rows)
             
-            return {
+            data = {
                 'ticker': ticker,
-                'current_price': latest['Close'],
-                'previous_close': previous['Close'],
-                'volume': latest['Volume'],
+                'current_price': quote['close'][latest],
+                'previous_close': quote['close'][previous],
+                'volume': quote['volume'][latest],
                 'avg_volume': avg_volume,
-                'high': latest['High'],
-                'low': latest['Low'],
-                'open': latest['Open'],
-                'timestamp': hist.index[-1]
+                'high': quote['high'][latest],
+                'low': quote['low'][latest],
+                'open': quote['open'][latest],
+                'timestamp': datetime.fromtimestamp(result['timestamp'][latest], tz=timezone.utc)
             }
+            self._price_cache[ticker] = (time.monotonic(), data)
+            await asyncio.to_thread(self.db.set_cached_response, disk_key, data, self._price_ttl)
+            return data
         
         except Exception as e:
             print(f"[!] Error fetching stock data for {ticker}: {e}")
             return None
     
+    async def _bulk_fetch(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch 5d daily bars for many tickers with one batched yfinance download
+        
+        Args:
+            tickers: Ticker symbols to fetch
+            
+        Returns:
+            Dict of ticker -> stock data (same shape as _fetch_stock_data);
+            tickers that failed or returned no bars are omitted
+        """
+        now = time.monotonic()
+        results = {}
+        stale = []
+        for ticker in tickers:
+            fetched_at, cached = self._price_cache.get(ticker, (0.0, None))
+            if cached and now - fetched_at < self._price_ttl:
+                results[ticker] = cached
+            else:
+                stale.append(ticker)
+        
+        if not stale:
+            return results
+        
+        # Fall back to the persistent cache so restarts don't refetch fresh data
+        on_disk = await asyncio.to_thread(
+            self.db.get_cached_responses, [_price_cache_key(t) for t in stale]
+        )
+        if on_disk:
+            remaining = []
+            for ticker in stale:
+                entry = on_disk.get(_price_cache_key(ticker))
+                if entry:
+                    results[ticker] = self._adopt_disk_price(ticker, *entry)
+                else:
+                    remaining.append(ticker)
+            stale = remaining
+            if not stale:
+                return results
+        
+        try:
+            frame = await asyncio.to_thread(
+                yf.download, " ".join(stale), period="5d", interval="1d",
+                group_by="ticker", auto_adjust=True, threads=True, progress=False
+            )
+        except Exception as e:
+            print(f"[!] Error bulk fetching stock data: {e}")
+            return results
+        
+        if frame is None or frame.empty:
+            return results
+        
+        multi = frame.columns.nlevels > 1
+        fetched_at = time.monotonic()
+        fresh = {}
+        for ticker in stale:
+            try:
+                if multi:
+                    if ticker not in frame.columns.get_level_values(0):
+                        continue
+                    hist = frame[ticker]
+                else:
+                    hist = frame
+                data = self._data_from_history(ticker, hist.dropna(subset=['Close']))
+            except Exception as e:
+                print(f"[!] Error reading bulk data for {ticker}: {e}")
+                continue
+            
+            if data:
+                self._price_cache[ticker] = (fetched_at, data)
+                results[ticker] = data
+                fresh[_price_cache_key(ticker)] = data
+        
+        await asyncio.to_thread(self.db.set_cached_responses, fresh, self._price_ttl)
+        return results
+    
+    def _adopt_disk_price(self, ticker: str, data: Dict, expires_at: float) -> Dict:
+        """Load a persistent-cache price into _price_cache for only its remaining lifetime"""
+        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        remaining = max(expires_at - time.time(), 0.0)
+        self._price_cache[ticker] = (time.monotonic() - (self._price_ttl - remaining), data)
+        return data
+    
+    def _data_from_history(self, ticker: str, hist) -> Optional[Dict]:
+        """Reduce a yfinance OHLCV history frame to the stock data dict"""
+        if hist.empty:
+            return None
+        
+        latest = hist.iloc[-1]
+        previous = hist.iloc[-2] if len(hist) > 1 else latest
+        
+        # Plain floats so the dict round-trips through the JSON response cache
+        return {
+            'ticker': ticker,
+            'current_price': float(latest['Close']),
+            'previous_close': float(previous['Close']),
+            'volume': float(latest['Volume']),
+            'avg_volume': float(hist['Volume'].mean()),
+            'high': float(latest['High']),
+            'low': float(latest['Low']),
+            'open': float(latest['Open']),
+            'timestamp': hist.index[-1].to_pydatetime()
+        }
+    
     def _check_volume_alert(self, data: Dict) -> bool:
         """Check if volume is unusually high"""
         volume_ratio = data['volume'] / data['avg_volume']
@@ -183,7 +540,9 @@ class AlertManager:
                 'volume_ratio': volume_ratio,
                 'volume': data['volume'],
                 'avg_volume': data['avg_volume'],
-                'direction': direction
+                'direction': direction,
+                'news_articles': [],
+                'reddit_posts': []
             }
         )
     
@@ -206,7 +565,9 @@ class AlertManager:
                 'price_change': price_change,
                 'previous_close': data['previous_close'],
                 'high': data['high'],
-                'low': data['low']
+                'low': data['low'],
+                'news_articles': [],
+                'reddit_posts': []
             }
         )
     
@@ -228,91 +589,148 @@ class AlertManager:
             details={
                 'gap': gap,
                 'previous_close': data['previous_close'],
-                'open': data['open']
+                'open': data['open'],
+                'news_articles': [],
+                'reddit_posts': []
             }
         )
     
+    async def _fetch_news(self, ticker: str) -> List[Dict]:
+        """Fetch recent news for ticker, reusing the persistent cache when fresh"""
+        disk_key = f"{ticker}:news"
+        cached = await asyncio.to_thread(self.db.get_cached_response, disk_key)
+        if cached is not None:
+            return cached
+        
+        news_data = await asyncio.to_thread(self.stock_fetcher.get_yahoo_finance_news, ticker, 3)
+        if news_data:
+            await asyncio.to_thread(self.db.set_cached_response, disk_key, news_data, self._news_ttl)
+        return news_data
+    
     async def _validate_with_sentiment(self, alert: Alert):
         """Validate alert with sentiment analysis"""
         try:
+            # Resolve the optional Reddit source before creating any coroutine,
+            # so a missing method can't leave the news fetch un-awaited
+            search_reddit = getattr(self.reddit_scraper, 'search_alerts', None)
+            sources = [self._fetch_news(alert.ticker)]
+            if search_reddit is not None:
+                sources.append(search_reddit(alert.ticker, limit=3))
+            
+            # News and Reddit are independent, so fetch them concurrently
+            news_data, *reddit_result = await asyncio.gather(*sources, return_exceptions=True)
+            reddit_data = reddit_result[0] if reddit_result else []
+            if isinstance(news_data, Exception) or not news_data:
+                news_data = []
+            if isinstance(reddit_data, Exception) or not reddit_data:
+                reddit_data = []
+            if not news_data and not reddit_data:
+                return
+            
+            # Score every headline and post title in one analyzer call
+            titles = [item.get('title', '') for item in news_data]
+            titles.extend(post.get('title', '') for post in reddit_data)
+            scores = await self._score_titles(titles)
+            news_scores = scores[:len(news_data)]
+            reddit_scores = scores[len(news_data):]
+            
             # Analyze news sentiment
-            news_data = await self.stock_fetcher.fetch_news(alert.ticker, limit=3)
-            if news_data:
-                sentiment_scores = []
-                for article in news_data:
-                    try:
-                        score = self.sentiment_analyzer.analyze(article.get('title', ''))['sentiment_score']
-                        sentiment_scores.append(score)
-                        if 'news_articles' not in alert.details:
-                            alert.details['news_articles'] = []
-                        alert.details['news_articles'].append({
-                            'title': article.get('title', ''),
-                            'url': article.get('link', ''),
-                            'sentiment': score
-                        })
-                    except:
-                        pass
-                
-                if sentiment_scores:
-                    alert.sentiment_score = sum(sentiment_scores) / len(sentiment_scores)
+            for article, score in zip(news_data, news_scores):
+                alert.details['news_articles'].append({
+                    'title': article.get('title', ''),
+                    'url': article.get('url') or article.get('link', ''),
+                    'sentiment': score
+                })
+            
+            if news_scores:
+                alert.sentiment_score = sum(news_scores) / len(news_scores)
             
             # Analyze Reddit sentiment
-            reddit_data = await self.reddit_scraper.search_alerts(alert.ticker, limit=3)
-            if reddit_data:
-                reddit_scores = []
-                for post in reddit_data:
-                    try:
-                        score = self.sentiment_analyzer.analyze(post.get('title', ''))['sentiment_score']
-                        reddit_scores.append(score)
-                        if 'reddit_posts' not in alert.details:
-                            alert.details['reddit_posts'] = []
-                        alert.details['reddit_posts'].append({
-                            'title': post.get('title', ''),
-                            'url': post.get('url', ''),
-                            'subreddit': post.get('subreddit', ''),
-                            'sentiment': score
-                        })
-                    except:
-                        pass
-                
-                if reddit_scores and alert.sentiment_score:
-                    # Weight news and Reddit equally
-                    alert.sentiment_score = (alert.sentiment_score + sum(reddit_scores) / len(reddit_scores)) / 2
-                elif reddit_scores:
-                    alert.sentiment_score = sum(reddit_scores) / len(reddit_scores)
+            for post, score in zip(reddit_data, reddit_scores):
+                alert.details['reddit_posts'].append({
+                    'title': post.get('title', ''),
+                    'url': post.get('url', ''),
+                    'subreddit': post.get('subreddit', ''),
+                    'sentiment': score
+                })
+            
+            if reddit_scores and alert.sentiment_score:
+                # Weight news and Reddit equally
+                alert.sentiment_score = (alert.sentiment_score + sum(reddit_scores) / len(reddit_scores)) / 2
+            elif reddit_scores:
+                alert.sentiment_score = sum(reddit_scores) / len(reddit_scores)
         
         except Exception as e:
             print(f"[!] Error validating sentiment for {alert.ticker}: {e}")
     
+    async def _score_titles(self, titles: List[str]) -> List[float]:
+        """Sentiment scores for titles, running the analyzer only on unseen ones"""
+        cache = self._sentiment_cache
+        keys = [title.strip() for title in titles]
+        
+        # Take cached scores before awaiting; a concurrent call may trim the cache meanwhile
+        known = {}
+        for key in dict.fromkeys(keys):
+            score = cache.get(key)
+            if score is not None:
+                cache.move_to_end(key)
+                known[key] = score
+        
+        misses = [key for key in dict.fromkeys(keys) if key not in known]
+        if misses:
+            # FinBERT/VADER scoring is CPU-bound; keep it off the event loop
+            batch = await asyncio.to_thread(self.sentiment_analyzer.analyze_batch, misses)
+            known.update(zip(misses, batch))
+            cache.update(zip(misses, batch))
+        
+        scores = [known[key] for key in keys]
+        
+        while len(cache) > self._sentiment_cache_size:
+            cache.popitem(last=False)
+        
+        return scores
+    
     def _filter_alerts(self, alerts: List[Alert]) -> List[Alert]:
         """Filter alerts based on cooldown and sentiment"""
         filtered = []
-        now = datetime.now()
+        now_ns = time.monotonic_ns()
+        self._prune_expired(now_ns)
         
         for alert in alerts:
             # Check cooldown
             alert_key = f"{alert.ticker}_{alert.alert_type.value}"
-            if alert_key in self.recent_alerts:
-                last_time = self.recent_alerts[alert_key]
-                if now - last_time < self.alert_cooldown:
-                    continue
+            last_ns = self.recent_alerts.get(alert_key)
+            if last_ns is not None and now_ns - last_ns < self._cooldown_ns:
+                continue
             
             # Check sentiment if available
             if alert.sentiment_score is not None:
                 # For bullish alerts, require bullish sentiment
-                if alert.alert_type in [AlertType.BREAKOUT, AlertType.GAP_UP]:
+                if alert.alert_type in _BULLISH_TYPES:
                     if alert.sentiment_score < -self.sentiment_threshold:
                         continue
                 # For bearish alerts, require bearish sentiment
-                elif alert.alert_type in [AlertType.DROP, AlertType.GAP_DOWN]:
+                elif alert.alert_type in _BEARISH_TYPES:
                     if alert.sentiment_score > self.sentiment_threshold:
                         continue
             
             filtered.append(alert)
-            self.recent_alerts[alert_key] = now
+            self.recent_alerts[alert_key] = now_ns
+            self.recent_alerts.move_to_end(alert_key)
+            if len(self.recent_alerts) > self.recent_alerts_max:
+                self.recent_alerts.popitem(last=False)
         
         return filtered
     
+    def _prune_expired(self, now_ns: int):
+        """Drop cooldown entries older than alert_cooldown from the front of recent_alerts"""
+        recent = self.recent_alerts
+        while recent:
+            key, sent_ns = next(iter(recent.items()))
+            if now_ns - sent_ns < self._cooldown_ns:
+                break
+            del recent[key]
+    
     async def send_alert(self, alert: Alert) -> bool:
         """
         Send alert to Discord
@@ -328,51 +746,36 @@ class AlertManager:
             return False
         
         try:
-            import requests
-            
-            # Format alert type
-            alert_type_emoji = {
-                AlertType.UNUSUAL_VOLUME: "📊",
-                AlertType.BREAKOUT: "🚀",
-                AlertType.DROP: "📉",
-                AlertType.GAP_UP: "⬆️",
-                AlertType.GAP_DOWN: "⬇️"
-            }.get(alert.alert_type, "⚠️")
-            
             # Build embed
+            fields = [
+                {
+                    "name": "Alert Type",
+                    "value": _pretty(alert.alert_type.value),
+                    "inline": True
+                },
+                {
+                    "name": "Price",
+                    "value": f"${alert.price:.2f}",
+                    "inline": True
+                },
+                {
+                    "name": "Confidence",
+                    "value": f"{alert.confidence * 100:.0f}%",
+                    "inline": True
+                },
+            ]
             embed = {
-                "title": f"{alert_type_emoji} {alert.ticker} Alert",
+                "title": f"{_EMOJI_BY_TYPE.get(alert.alert_type, _DEFAULT_EMOJI)} {alert.ticker} Alert",
                 "color": self._get_alert_color(alert),
-                "fields": [],
+                "fields": fields,
                 "timestamp": alert.timestamp.isoformat()
             }
             
-            # Add alert type
-            embed["fields"].append({
-                "name": "Alert Type",
-                "value": alert.alert_type.value.replace("_", " ").title(),
-                "inline": True
-            })
-            
-            # Add price
-            embed["fields"].append({
-                "name": "Price",
-                "value": f"${alert.price:.2f}",
-                "inline": True
-            })
-            
-            # Add confidence
-            embed["fields"].append({
-                "name": "Confidence",
-                "value": f"{alert.confidence * 100:.0f}%",
-                "inline": True
-            })
-            
             # Add sentiment if available
             if alert.sentiment_score is not None:
                 sentiment_emoji = "🐂" if alert.sentiment_score > 0 else "🐻"
                 sentiment_text = "Bullish" if alert.sentiment_score > 0 else "Bearish"
-                embed["fields"].append({
+                fields.append({
                     "name": "Sentiment",
                     "value": f"{sentiment_emoji} {sentiment_text} ({abs(alert.sentiment_score) * 100:.0f}%)",
                     "inline": True
@@ -380,14 +783,14 @@ class AlertManager:
             
             # Add details
             for key, value in alert.details.items():
-                if key not in ['news_articles', 'reddit_posts']:
+                if key not in _LINK_DETAIL_KEYS:
                     if isinstance(value, float):
                         if abs(value) < 1:
                             value = f"{value * 100:.2f}%"
                         else:
                             value = f"{value:.2f}"
-                    embed["fields"].append({
-                        "name": key.replace("_", " ").title(),
+                    fields.append({
+                        "name": _pretty(key),
                         "value": str(value),
                         "inline": True
                     })
@@ -398,7 +801,7 @@ class AlertManager:
                     f"[{article['title'][:50]}...]({article['url']})"
                     for article in alert.details['news_articles'][:3]
                 ])
-                embed["fields"].append({
+                fields.append({
                     "name": "📰 News",
                     "value": news_text,
                     "inline": False
@@ -410,20 +813,14 @@ class AlertManager:
                     f"[{post['title'][:50]}...]({post['url']})"
                     for post in alert.details['reddit_posts'][:3]
                 ])
-                embed["fields"].append({
+                fields.append({
                     "name": "💬 Reddit",
                     "value": reddit_text,
                     "inline": False
                 })
             
             # Send to Discord
-            response = requests.post(
-                self.discord_webhook,
-                json={"embeds": [embed]},
-                timeout=10
-            )
-            
-            return response.status_code == 204
+            return await self._post_json(self.discord_webhook, {"embeds": [embed]}) == 204
         
         except Exception as e:
             print(f"[!] Error sending alert to Discord: {e}")
@@ -431,12 +828,7 @@ class AlertManager:
     
     def _get_alert_color(self, alert: Alert) -> int:
         """Get color for alert embed"""
-        if alert.alert_type in [AlertType.BREAKOUT, AlertType.GAP_UP]:
-            return 5763719  # Green
-        elif alert.alert_type in [AlertType.DROP, AlertType.GAP_DOWN]:
-            return 15548997  # Red
-        else:
-            return 16776960  # Yellow
+        return _COLOR_BY_TYPE.get(alert.alert_type, _DEFAULT_COLOR)
     
     async def scan_for_alerts(self, tickers: List[str]) -> List[Alert]:
         """
@@ -450,8 +842,69 @@ class AlertManager:
         """
         all_alerts = []
         
+        # Drop duplicates and tickers scanned within _scan_interval_ns, then
+        # scan the stalest first
+        now_ns = time.monotonic_ns()
+        last_scan = self._last_scan_ns
+        tickers = [
+            t for t in dict.fromkeys(tickers)
+            if now_ns - last_scan.get(t, -self._scan_interval_ns) >= self._scan_interval_ns
+        ]
+        tickers.sort(key=lambda t: last_scan.get(t, 0))
+        if not tickers:
+            return all_alerts
+        
+        # One batched download for the whole list; anything it misses falls
+        # back to a per-ticker fetch inside check_alerts
+        prefetched = await self._bulk_fetch(tickers)
+        checks = self._vector_checks(prefetched)
+        
+        # Only tickers that tripped a check (or weren't prefetched) need the
+        # per-ticker path; the rest are settled by the vector masks
+        scanned = []
+        jobs = []
         for ticker in tickers:
-            alerts = await self.check_alerts(ticker)
-            all_alerts.extend(alerts)
+            data = prefetched.get(ticker)
+            if data is None:
+                jobs.append(self.check_alerts(ticker))
+            elif any(checks[ticker]):
+                jobs.append(self.check_alerts(ticker, data=data, checks=checks[ticker]))
+            else:
+                last_scan[ticker] = now_ns
+                continue
+            scanned.append(ticker)
         
-        return all_alerts
\ No newline at end of file
+        # Tickers are I/O bound, so check them concurrently (bounded by _scan_sem)
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        
+        for ticker, result in zip(scanned, results):
+            if isinstance(result, Exception):
+                print(f"[!] Error scanning {ticker}: {result}")
+                continue
+            last_scan[ticker] = now_ns
+            all_alerts.extend(result)
+        
+        return all_alerts
+    
+    def _vector_checks(self, stock_data: Dict[str, Dict]) -> Dict[str, Tuple[bool, bool, bool]]:
+        """Run the three alert checks for every prefetched ticker at once"""
+        if not stock_data:
+            return {}
+        
+        tickers = list(stock_data)
+        rows = [stock_data[t] for t in tickers]
+        
+        def column(key):
+            # Yahoo can omit a bar's volume/open; NaN compares False, so it never triggers
+            return np.fromiter((np.nan if row[key] is None else row[key] for row in rows),
+                               dtype=np.float64, count=len(rows))
+        
+        masks = _alert_masks(
+            column('current_price'), column('previous_close'), column('volume'),
+            column('avg_volume'), column('open'),
+            self.volume_threshold, self.price_change_threshold
+        )
+        return {
+            ticker: (bool(volume_hit), bool(price_hit), bool(gap_hit))
+            for ticker, volume_hit, price_hit, gap_hit in zip(tickers, *masks)
+        }
@@ -3,10 +3,350 @@ Analysis, scoring, and assessment module - ENHANCED VERSION
 New features: Momentum scoring, Price alerts, Social sentiment integration
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+import bisect
+import functools
+import re
+import numpy as np
+import pandas as pd
 from config import *
 
 
+# Subreddit credibility tiers (casefolded names); anything unlisted scores 8
+_TIER1_SUBS = frozenset({'wallstreetbets', 'stocks', 'investing'})
+_TIER2_SUBS = frozenset({'options', 'securityanalysis', 'valueinvesting'})
+_SUBREDDIT_POINTS = {**dict.fromkeys(_TIER1_SUBS, 15), **dict.fromkeys(_TIER2_SUBS, 12)}
+
+# Flair text -> points; scrapers only ever see a few dozen distinct flairs
+_FLAIR_POINTS: Dict[str, int] = {}
+
+
+def _normalized(post: Dict, key: str) -> str:
+    """Casefolded post field, preferring the `<key>_norm` copy set at ingestion"""
+    norm = post.get(f'{key}_norm')
+    if norm is None:
+        norm = (post.get(key, '') or '').casefold()
+    return norm
+
+
+# Post age window for the time relevance points
+_FRESH_POST_HOURS = 24
+_STALE_POST_HOURS = 24 * 7
+
+
+def _post_age_hours(post: Dict, now: datetime) -> float:
+    """Hours since the post's created_utc (ISO string or epoch), NaN if unknown"""
+    created = post.get('created_utc')
+    try:
+        if isinstance(created, str):
+            created = datetime.fromisoformat(created)
+        elif isinstance(created, (int, float)):
+            created = datetime.fromtimestamp(created)
+        else:
+            return float('nan')
+        return (now - created).total_seconds() / 3600
+    except (ValueError, TypeError, OverflowError, OSError):
+        return float('nan')
+
+
+# One case-insensitive pass over the flair; the lookaheads are tried in
+# priority order, so "Discussion of DD" still scores as DD
+_FLAIR_PATTERN = re.compile(
+    r'(?=.*?(dd|due diligence))|(?=.*?(analysis))|(?=.*?(discussion))',
+    re.IGNORECASE | re.DOTALL
+)
+_FLAIR_GROUP_POINTS = (0, 15, 10, 5)
+
+
+def _flair_points(flair: str) -> int:
+    """Quality points for a post flair (max 15)"""
+    points = _FLAIR_POINTS.get(flair)
+    if points is None:
+        match = _FLAIR_PATTERN.match(flair)
+        points = _FLAIR_POINTS[flair] = _FLAIR_GROUP_POINTS[match.lastindex] if match else 0
+    return points
+
+
+# Multi-timeframe momentum weights; recent performance matters most
+_MOM_PERIODS = ('1M', '3M', '6M', '1Y', '2Y', '3Y')
+_MOM_WEIGHTS = np.array([0.30, 0.25, 0.20, 0.15, 0.05, 0.05])
+_MOM_THRESHOLDS = np.array([25, 40, 60, 75])
+_MOM_CLASSES = (
+    ('STRONG_BEARISH', '[--]'),
+    ('BEARISH', '[-]'),
+    ('NEUTRAL', '[~]'),
+    ('BULLISH', '[+]'),
+    ('STRONG_BULLISH', '[++]'),
+)
+
+
+def _momentum_kernel(returns, weights, out):
+    """
+    Row-wise weighted momentum score, fusing clip/multiply/sum in one pass
+    
+    NaN returns are skipped; rows with no data score 50.
+    """
+    for i in prange(returns.shape[0]):
+        weighted = 0.0
+        total_weight = 0.0
+        for k in range(returns.shape[1]):
+            r = returns[i, k]
+            if not np.isnan(r):
+                period_score = min(max(r + 50.0, 0.0), 100.0)
+                weighted += period_score * weights[k]
+                total_weight += weights[k]
+        out[i] = weighted / total_weight if total_weight > 0.0 else 50.0
+
+
+# Compile the momentum kernel when Numba is installed; warm it up so the
+# first frame doesn't pay for compilation. Without Numba, _momentum_kernel
+# is never called (score_momentum_frame has a NumPy path instead)
+_numba_available = False
+try:
+    from numba import njit, prange
+    _momentum_kernel = njit(parallel=True, cache=True)(_momentum_kernel)
+    _momentum_kernel(np.zeros((1, len(_MOM_PERIODS))), _MOM_WEIGHTS, np.empty(1))
+    _numba_available = True
+except ImportError:
+    pass
+
+
+@dataclass(slots=True, frozen=True)
+class StockView:
+    """Attribute view over the stock_data fields the scalar assessments read"""
+    price: Optional[float]
+    high_52: Optional[float]
+    low_52: Optional[float]
+    beta: Optional[float]
+    debt_to_equity: Optional[float]
+    current_ratio: Optional[float]
+    profit_margin: Optional[float]
+    market_cap: Optional[float]
+    volume: Optional[float]
+    avg_volume: Optional[float]
+    price_target: Optional[float]
+    
+    @classmethod
+    def from_dict(cls, stock_data: Dict) -> 'StockView':
+        get = stock_data.get
+        return cls(
+            price=get('price'),
+            high_52=get('52w_high'),
+            low_52=get('52w_low'),
+            beta=get('beta'),
+            debt_to_equity=get('debt_to_equity'),
+            current_ratio=get('current_ratio'),
+            profit_margin=get('profit_margin'),
+            market_cap=get('market_cap'),
+            volume=get('volume'),
+            avg_volume=get('avg_volume'),
+            price_target=get('price_target'),
+        )
+
+
+# format_number magnitude table: lower bounds and (divisor, suffix) per band
+_MONEY_BOUNDS = (1e3, 1e6, 1e9, 1e12)
+_MONEY_SCALES = ((1e3, 'K'), (1e6, 'M'), (1e9, 'B'), (1e12, 'T'))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_money(num) -> str:
+    """Dollar string for a number; market caps and volumes repeat across reports"""
+    if not num >= 1e3:  # also catches NaN and negatives
+        return f"${num:,.2f}"
+    divisor, suffix = _MONEY_SCALES[bisect.bisect_right(_MONEY_BOUNDS, num) - 1]
+    return f"${num / divisor:.2f}{suffix}"
+
+
+# Technical summary detail lines that embed one value
+_TPL_RSI_OVERSOLD = "📊 **RSI: %.1f** - Oversold (Bullish)"
+_TPL_RSI_OVERBOUGHT = "📊 **RSI: %.1f** - Overbought (Bearish)"
+_TPL_RSI_NEUTRAL = "📊 **RSI: %.1f** - Neutral"
+_TPL_ABOVE_200 = "[OK] **Long-term:** Above 200 SMA ($%.2f)"
+_TPL_BELOW_200 = "❌ **Long-term:** Below 200 SMA ($%.2f)"
+_TPL_VOLUME_HIGH = "📊 **Volume:** %.1fx average 🔥 (High interest)"
+_TPL_VOLUME_LOW = "📊 **Volume:** %.1fx average ⚠️ (Low interest)"
+
+
+# Input columns for the column-wise (DataFrame) assessments
+_RISK_COLUMNS = ('beta', 'debt_to_equity', 'current_ratio', 'profit_margin', 'market_cap')
+_VALUATION_COLUMNS = ('pe_ratio', 'peg_ratio', 'price_to_book')
+_PRICE_ALERT_COLUMNS = ('price', '52w_high', '52w_low', 'sma_200', 'volume', 'avg_volume', 'max_drawdown')
+_RISK_LEVELS = ("🔴 **VERY HIGH RISK**", "⚠️ **HIGH RISK**", "🟡 **MODERATE RISK**", "🟢 **LOWER RISK**")
+_RISK_COLORS = (COLOR_RISK_VERY_HIGH, COLOR_RISK_HIGH, COLOR_RISK_MODERATE, COLOR_RISK_LOW)
+
+
+def _frame_dtype(cols: pd.DataFrame):
+    """Keep a StockTable's float32 columns as float32; anything else computes in float64"""
+    if len(cols.columns) and (cols.dtypes == np.float32).all():
+        return np.float32
+    return np.float64
+
+
+class StockTable:
+    """
+    Columnar float32 store of the stock fields the *_frame assessments read
+    
+    One row per ticker; None, 'N/A' and other non-numeric values become NaN.
+    Single-precision floats halve the memory traffic of whole-market scans, at the
+    cost of ~7 significant digits, which is plenty for ratio and % thresholds.
+    """
+    COLUMNS = tuple(dict.fromkeys(_RISK_COLUMNS + _VALUATION_COLUMNS + _PRICE_ALERT_COLUMNS + _MOM_PERIODS))
+    
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+    
+    @classmethod
+    def from_stocks(cls, stocks: Dict[str, Dict]) -> 'StockTable':
+        """
+        Build a table from ticker -> stock_data dicts
+        
+        Fields are read from the top level, then technical_indicators
+        (sma_200) and mtf_performance (1M..3Y).
+        """
+        rows = {}
+        for ticker, stock_data in stocks.items():
+            nested = {**stock_data.get('technical_indicators', {}), **stock_data.get('mtf_performance', {})}
+            rows[ticker] = [stock_data.get(c, nested.get(c)) for c in cls.COLUMNS]
+        frame = pd.DataFrame.from_dict(rows, orient='index', columns=list(cls.COLUMNS))
+        return cls(frame.apply(pd.to_numeric, errors='coerce').astype(np.float32))
+    
+    def __len__(self) -> int:
+        return len(self.frame)
+
+
+def _missing(values: np.ndarray) -> np.ndarray:
+    """Frame counterpart of the scalar methods' `if not value` check"""
+    return np.isnan(values) | (values == 0)
+
+
+class RiskResult(NamedTuple):
+    """Risk assessment for one stock; field names match get_risk_assessment's dict keys"""
+    risk_level: str
+    risk_score: int
+    risk_factors: Tuple[str, ...]
+    color: int
+
+
+@functools.lru_cache(maxsize=4096)
+def _risk_core(beta, debt_to_equity, current_ratio, profit_margin, market_cap) -> RiskResult:
+    """Cached body of AnalysisEngine.assess_risk"""
+    risk_factors = []
+    risk_score = 0  # 0 = low risk, 100 = high risk
+    
+    # Volatility (Beta)
+    if beta:
+        if beta > 2:
+            risk_factors.append("🔴 Very High Vol (β > 2.0)")
+            risk_score += 30
+        elif beta > 1.5:
+            risk_factors.append("⚠️ High Vol (β > 1.5)")
+            risk_score += 20
+        elif beta < 0.5:
+            risk_factors.append("🟢 Low Vol (β < 0.5)")
+            risk_score += 5
+        else:
+            risk_factors.append(f"🟡 Moderate Vol (β = {beta:.2f})")
+            risk_score += 10
+
+    # Debt levels
+    if debt_to_equity:
+        if debt_to_equity > 2:
+            risk_factors.append(f"🔴 High Debt (D/E = {debt_to_equity:.2f})")
+            risk_score += 25
+        elif debt_to_equity > 1:
+            risk_factors.append(f"⚠️ Moderate Debt (D/E = {debt_to_equity:.2f})")
+            risk_score += 15
+        else:
+            risk_factors.append(f"[+] Low Debt (D/E = {debt_to_equity:.2f})")
+            risk_score += 5
+
+    # Liquidity
+    if current_ratio:
+        if current_ratio < 1:
+            risk_factors.append(f"🔴 Liquidity Risk (CR = {current_ratio:.2f})")
+            risk_score += 20
+        elif current_ratio < 1.5:
+            risk_factors.append(f"⚠️ Tight Liquidity (CR = {current_ratio:.2f})")
+            risk_score += 10
+        else:
+            risk_factors.append(f"[+] Good Liquidity (CR = {current_ratio:.2f})")
+            risk_score += 3
+
+    # Profitability
+    if profit_margin:
+        if profit_margin < 0:
+            risk_factors.append("[-] Unprofitable (Negative margins)")
+            risk_score += 25
+        elif profit_margin < 0.05:
+            risk_factors.append(f"⚠️ Low Margins ({profit_margin*100:.1f}%)")
+            risk_score += 15
+        else:
+            risk_factors.append(f"[+] Profitable ({profit_margin*100:.1f}% margin)")
+            risk_score += 5
+
+    # Market cap
+    if market_cap:
+        if market_cap < 300_000_000:
+            risk_factors.append("🔴 Micro Cap (Extreme Risk)")
+            risk_score += 25
+        elif market_cap < 2_000_000_000:
+            risk_factors.append("⚠️ Small Cap (High Risk)")
+            risk_score += 15
+        elif market_cap < 10_000_000_000:
+            risk_factors.append("[~] Mid Cap (Moderate Risk)")
+            risk_score += 8
+        else:
+            risk_factors.append("[+] Large Cap (Lower Risk)")
+            risk_score += 3
+
+    # Determine risk level
+    if risk_score >= 70:
+        risk_level = "🔴 **VERY HIGH RISK**"
+        color = COLOR_RISK_VERY_HIGH
+    elif risk_score >= 50:
+        risk_level = "⚠️ **HIGH RISK**"
+        color = COLOR_RISK_HIGH
+    elif risk_score >= 30:
+        risk_level = "🟡 **MODERATE RISK**"
+        color = COLOR_RISK_MODERATE
+    else:
+        risk_level = "🟢 **LOWER RISK**"
+        color = COLOR_RISK_LOW
+
+    return RiskResult(risk_level, risk_score, tuple(risk_factors), color)
+
+
+@functools.lru_cache(maxsize=4096)
+def _valuation_core(pe_ratio, peg_ratio, price_to_book) -> str:
+    """Cached body of AnalysisEngine.get_valuation_assessment"""
+    signals = []
+
+    if pe_ratio:
+        if pe_ratio < 0:
+            signals.append("⚠️ Negative P/E (Unprofitable)")
+        elif pe_ratio < 15:
+            signals.append(f"[OK] Low P/E ({pe_ratio:.1f}) - Potentially undervalued")
+        elif pe_ratio > 40:
+            signals.append(f"⚠️ High P/E ({pe_ratio:.1f}) - Potentially overvalued")
+
+    if peg_ratio:
+        if peg_ratio < 1:
+            signals.append(f"[OK] PEG < 1.0 ({peg_ratio:.2f}) - Growth undervalued")
+        elif peg_ratio > 2:
+            signals.append(f"⚠️ PEG > 2.0 ({peg_ratio:.2f}) - Growth overvalued")
+
+    if price_to_book:
+        if price_to_book < 1:
+            signals.append(f"[OK] P/B < 1.0 ({price_to_book:.2f}) - Trading below book value")
+        elif price_to_book > 5:
+            signals.append(f"⚠️ P/B > 5.0 ({price_to_book:.2f}) - High premium to book")
+
+    return "\n".join(signals) if signals else "No clear valuation signal"
+
+
 class AnalysisEngine:
     """Handles quality scoring, risk assessment, technical analysis, and momentum detection"""
     
@@ -46,157 +386,113 @@ class AnalysisEngine:
         
         score += ratio * 10
         
-        # Flair score (max 15 points)
-        flair = post.get('flair', '') or ''
-        flair_lower = flair.lower()
-        if 'dd' in flair_lower or 'due diligence' in flair_lower:
-            score += 15
-        elif 'analysis' in flair_lower:
-            score += 10
-        elif 'discussion' in flair_lower:
-            score += 5
+        # Flair score (max 15 points) and subreddit credibility (max 15 points);
+        # the scraper stores casefolded copies, older post dicts fall back
+        score += _flair_points(_normalized(post, 'flair'))
+        score += _SUBREDDIT_POINTS.get(_normalized(post, 'subreddit'), 8)
         
-        # Subreddit credibility (max 15 points)
-        subreddit = post.get('subreddit', '') or ''
-        subreddit_lower = subreddit.lower()
-        if subreddit_lower in ['wallstreetbets', 'stocks', 'investing']:
-            score += 15
-        elif subreddit_lower in ['options', 'securityanalysis', 'valueinvesting']:
-            score += 12
+        # Time relevance (max 10 points): full marks for the first day, fading
+        # to nothing at a week; posts without a usable created_utc keep all 10
+        age_hours = _post_age_hours(post, datetime.now()) if post.get('created_utc') is not None else float('nan')
+        if age_hours != age_hours:
+            score += 10
         else:
-            score += 8
-        
-        # Time relevance (max 10 points)
-        score += 10
+            freshness = (_STALE_POST_HOURS - age_hours) / (_STALE_POST_HOURS - _FRESH_POST_HOURS)
+            score += min(max(freshness, 0), 1) * 10
         
         return min(score, 100)
     
     def get_risk_assessment(self, stock_data: Dict) -> Dict:
         """Generate risk assessment based on multiple factors"""
-        risk_factors = []
-        risk_score = 0  # 0 = low risk, 100 = high risk
-        
-        # Volatility (Beta)
-        beta = stock_data.get('beta')
-        if beta:
-            if beta > 2:
-                risk_factors.append("🔴 Very High Vol (β > 2.0)")
-                risk_score += 30
-            elif beta > 1.5:
-                risk_factors.append("⚠️ High Vol (β > 1.5)")
-                risk_score += 20
-            elif beta < 0.5:
-                risk_factors.append("🟢 Low Vol (β < 0.5)")
-                risk_score += 5
-            else:
-                risk_factors.append(f"🟡 Moderate Vol (β = {beta:.2f})")
-                risk_score += 10
-        
-        # Debt levels
-        debt_to_equity = stock_data.get('debt_to_equity')
-        if debt_to_equity:
-            if debt_to_equity > 2:
-                risk_factors.append(f"🔴 High Debt (D/E = {debt_to_equity:.2f})")
-                risk_score += 25
-            elif debt_to_equity > 1:
-                risk_factors.append(f"⚠️ Moderate Debt (D/E = {debt_to_equity:.2f})")
-                risk_score += 15
-            else:
-                risk_factors.append(f"[+] Low Debt (D/E = {debt_to_equity:.2f})")
-                risk_score += 5
-        
-        # Liquidity
-        current_ratio = stock_data.get('current_ratio')
-        if current_ratio:
-            if current_ratio < 1:
-                risk_factors.append(f"🔴 Liquidity Risk (CR = {current_ratio:.2f})")
-                risk_score += 20
-            elif current_ratio < 1.5:
-                risk_factors.append(f"⚠️ Tight Liquidity (CR = {current_ratio:.2f})")
-                risk_score += 10
-            else:
-                risk_factors.append(f"[+] Good Liquidity (CR = {current_ratio:.2f})")
-                risk_score += 3
-        
-        # Profitability
-        profit_margin = stock_data.get('profit_margin')
-        if profit_margin:
-            if profit_margin < 0:
-                risk_factors.append("[-] Unprofitable (Negative margins)")
-                risk_score += 25
-            elif profit_margin < 0.05:
-                risk_factors.append(f"⚠️ Low Margins ({profit_margin*100:.1f}%)")
-                risk_score += 15
-            else:
-                risk_factors.append(f"[+] Profitable ({profit_margin*100:.1f}% margin)")
-                risk_score += 5
-        
-        # Market cap
-        market_cap = stock_data.get('market_cap')
-        if market_cap:
-            if market_cap < 300_000_000:
-                risk_factors.append("🔴 Micro Cap (Extreme Risk)")
-                risk_score += 25
-            elif market_cap < 2_000_000_000:
-                risk_factors.append("⚠️ Small Cap (High Risk)")
-                risk_score += 15
-            elif market_cap < 10_000_000_000:
-                risk_factors.append("[~] Mid Cap (Moderate Risk)")
-                risk_score += 8
-            else:
-                risk_factors.append("[+] Large Cap (Lower Risk)")
-                risk_score += 3
-        
-        # Determine risk level
-        if risk_score >= 70:
-            risk_level = "🔴 **VERY HIGH RISK**"
-            color = COLOR_RISK_VERY_HIGH
-        elif risk_score >= 50:
-            risk_level = "⚠️ **HIGH RISK**"
-            color = COLOR_RISK_HIGH
-        elif risk_score >= 30:
-            risk_level = "🟡 **MODERATE RISK**"
-            color = COLOR_RISK_MODERATE
-        else:
-            risk_level = "🟢 **LOWER RISK**"
-            color = COLOR_RISK_LOW
+        result = self.assess_risk(stock_data)
+        return {**result._asdict(), 'risk_factors': list(result.risk_factors)}
+    
+    def assess_risk(self, stock_data: Dict) -> RiskResult:
+        """
+        Risk assessment as an immutable RiskResult
         
-        return {
-            'risk_level': risk_level,
+        Cheaper to pass around or pickle than the get_risk_assessment dict;
+        convert with ._asdict() only where a dict is needed.
+        """
+        sv = StockView.from_dict(stock_data)
+        return _risk_core(sv.beta, sv.debt_to_equity, sv.current_ratio, sv.profit_margin, sv.market_cap)
+    
+    def assess_risk_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Column-wise get_risk_assessment over many stocks
+        
+        Args:
+            df: One row per stock with beta, debt_to_equity, current_ratio,
+                profit_margin and market_cap columns (NaN or 0 = missing)
+            
+        Returns:
+            DataFrame indexed like df with risk_score, risk_level and color
+        """
+        cols = df.reindex(columns=_RISK_COLUMNS)
+        dtype = _frame_dtype(cols)
+        beta, de, cr, pm, mc = (cols[c].to_numpy(dtype=dtype) for c in _RISK_COLUMNS)
+        
+        with np.errstate(invalid='ignore'):
+            risk_score = (
+                np.select([_missing(beta), beta > 2, beta > 1.5, beta < 0.5], [0, 30, 20, 5], 10)
+                + np.select([_missing(de), de > 2, de > 1], [0, 25, 15], 5)
+                + np.select([_missing(cr), cr < 1, cr < 1.5], [0, 20, 10], 3)
+                + np.select([_missing(pm), pm < 0, pm < 0.05], [0, 25, 15], 5)
+                + np.select([_missing(mc), mc < 300_000_000, mc < 2_000_000_000, mc < 10_000_000_000],
+                            [0, 25, 15, 8], 3)
+            )
+        
+        bands = [risk_score >= 70, risk_score >= 50, risk_score >= 30]
+        return pd.DataFrame({
             'risk_score': risk_score,
-            'risk_factors': risk_factors,
-            'color': color
-        }
+            'risk_level': np.select(bands, _RISK_LEVELS[:3], _RISK_LEVELS[3]),
+            'color': np.select(bands, _RISK_COLORS[:3], _RISK_COLORS[3]),
+        }, index=df.index)
     
     def get_valuation_assessment(self, stock_data: Dict) -> str:
         """Assess if stock is overvalued/undervalued"""
-        signals = []
+        return _valuation_core(
+            stock_data.get('pe_ratio'), stock_data.get('peg_ratio'), stock_data.get('price_to_book')
+        )
+    
+    def assess_valuation_frame(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Column-wise get_valuation_assessment over many stocks
+        
+        Args:
+            df: One row per stock with pe_ratio, peg_ratio and price_to_book
+                columns (NaN or 0 = missing)
+            
+        Returns:
+            Series of valuation summaries indexed like df
+        """
+        cols = df.reindex(columns=_VALUATION_COLUMNS)
+        dtype = _frame_dtype(cols)
+        pe, peg, pb = (cols[c].to_numpy(dtype=dtype) for c in _VALUATION_COLUMNS)
+        
+        # Pick each row's template per metric, then format only the rows that have one
+        with np.errstate(invalid='ignore'):
+            templates = (
+                (np.select([_missing(pe), pe < 0, pe < 15, pe > 40],
+                           ['', "⚠️ Negative P/E (Unprofitable)",
+                            "[OK] Low P/E (%.1f) - Potentially undervalued",
+                            "⚠️ High P/E (%.1f) - Potentially overvalued"], ''), pe),
+                (np.select([_missing(peg), peg < 1, peg > 2],
+                           ['', "[OK] PEG < 1.0 (%.2f) - Growth undervalued",
+                            "⚠️ PEG > 2.0 (%.2f) - Growth overvalued"], ''), peg),
+                (np.select([_missing(pb), pb < 1, pb > 5],
+                           ['', "[OK] P/B < 1.0 (%.2f) - Trading below book value",
+                            "⚠️ P/B > 5.0 (%.2f) - High premium to book"], ''), pb),
+            )
         
-        pe_ratio = stock_data.get('pe_ratio')
-        peg_ratio = stock_data.get('peg_ratio')
-        price_to_book = stock_data.get('price_to_book')
-        
-        if pe_ratio:
-            if pe_ratio < 0:
-                signals.append("⚠️ Negative P/E (Unprofitable)")
-            elif pe_ratio < 15:
-                signals.append(f"[OK] Low P/E ({pe_ratio:.1f}) - Potentially undervalued")
-            elif pe_ratio > 40:
-                signals.append(f"⚠️ High P/E ({pe_ratio:.1f}) - Potentially overvalued")
-        
-        if peg_ratio:
-            if peg_ratio < 1:
-                signals.append(f"[OK] PEG < 1.0 ({peg_ratio:.2f}) - Growth undervalued")
-            elif peg_ratio > 2:
-                signals.append(f"⚠️ PEG > 2.0 ({peg_ratio:.2f}) - Growth overvalued")
-        
-        if price_to_book:
-            if price_to_book < 1:
-                signals.append(f"[OK] P/B < 1.0 ({price_to_book:.2f}) - Trading below book value")
-            elif price_to_book > 5:
-                signals.append(f"⚠️ P/B > 5.0 ({price_to_book:.2f}) - High premium to book")
-        
-        return "\n".join(signals) if signals else "No clear valuation signal"
+        summaries = []
+        for row in range(len(df)):
+            signals = [
+                tmpl[row] % values[row] if '%' in tmpl[row] else tmpl[row]
+                for tmpl, values in templates if tmpl[row]
+            ]
+            summaries.append("\n".join(signals) if signals else "No clear valuation signal")
+        return pd.Series(summaries, index=df.index, dtype=object)
     
     def get_technical_analysis_summary(self, indicators: Dict, current_price: float) -> Dict:
         """Generate human-readable technical analysis summary"""
@@ -209,19 +505,21 @@ class AnalysisEngine:
         if not indicators:
             return summary
         
-        signals = []
+        details = summary['details']
+        bullish_score = 0
+        bearish_score = 0
         
         # RSI analysis
         rsi = indicators.get('rsi')
         if rsi:
             if rsi < RSI_OVERSOLD:
-                signals.append(('BULLISH', 2, f"RSI oversold at {rsi:.1f}"))
-                summary['details'].append(f"📊 **RSI: {rsi:.1f}** - Oversold (Bullish)")
+                bullish_score += 2
+                details.append(_TPL_RSI_OVERSOLD % rsi)
             elif rsi > RSI_OVERBOUGHT:
-                signals.append(('BEARISH', 2, f"RSI overbought at {rsi:.1f}"))
-                summary['details'].append(f"📊 **RSI: {rsi:.1f}** - Overbought (Bearish)")
+                bearish_score += 2
+                details.append(_TPL_RSI_OVERBOUGHT % rsi)
             else:
-                summary['details'].append(f"📊 **RSI: {rsi:.1f}** - Neutral")
+                details.append(_TPL_RSI_NEUTRAL % rsi)
         
         # Moving average analysis
         sma_20 = indicators.get('sma_20')
@@ -230,53 +528,50 @@ class AnalysisEngine:
         
         if sma_20 and sma_50:
             if current_price > sma_20 > sma_50:
-                signals.append(('BULLISH', 2, "Price above 20 & 50 SMA"))
-                summary['details'].append("📈 **MA Signal:** Bullish (Price > 20 SMA > 50 SMA)")
+                bullish_score += 2
+                details.append("📈 **MA Signal:** Bullish (Price > 20 SMA > 50 SMA)")
             elif current_price < sma_20 < sma_50:
-                signals.append(('BEARISH', 2, "Price below 20 & 50 SMA"))
-                summary['details'].append("📉 **MA Signal:** Bearish (Price < 20 SMA < 50 SMA)")
+                bearish_score += 2
+                details.append("📉 **MA Signal:** Bearish (Price < 20 SMA < 50 SMA)")
         
         if sma_200:
             if current_price > sma_200:
-                signals.append(('BULLISH', 1, f"Above 200 SMA"))
-                summary['details'].append(f"[OK] **Long-term:** Above 200 SMA (${sma_200:.2f})")
+                bullish_score += 1
+                details.append(_TPL_ABOVE_200 % sma_200)
             else:
-                signals.append(('BEARISH', 1, f"Below 200 SMA"))
-                summary['details'].append(f"❌ **Long-term:** Below 200 SMA (${sma_200:.2f})")
+                bearish_score += 1
+                details.append(_TPL_BELOW_200 % sma_200)
         
         # MACD analysis
         macd = indicators.get('macd')
         if macd:
             if macd > 0:
-                signals.append(('BULLISH', 1, "MACD positive"))
-                summary['details'].append(f"⬆️ **MACD:** Positive momentum")
+                bullish_score += 1
+                details.append("⬆️ **MACD:** Positive momentum")
             else:
-                signals.append(('BEARISH', 1, "MACD negative"))
-                summary['details'].append(f"⬇️ **MACD:** Negative momentum")
+                bearish_score += 1
+                details.append("⬇️ **MACD:** Negative momentum")
         
         # Bollinger Bands
         bb_upper = indicators.get('bollinger_upper')
         bb_lower = indicators.get('bollinger_lower')
         if bb_upper and bb_lower:
             if current_price >= bb_upper:
-                signals.append(('BEARISH', 1, "At upper Bollinger Band"))
-                summary['details'].append("[-] **Bollinger:** At upper band (Overbought)")
+                bearish_score += 1
+                details.append("[-] **Bollinger:** At upper band (Overbought)")
             elif current_price <= bb_lower:
-                signals.append(('BULLISH', 1, "At lower Bollinger Band"))
-                summary['details'].append("[+] **Bollinger:** At lower band (Oversold)")
+                bullish_score += 1
+                details.append("[+] **Bollinger:** At lower band (Oversold)")
         
         # Volume analysis
         volume_ratio = indicators.get('volume_ratio')
         if volume_ratio:
             if volume_ratio > HIGH_VOLUME_THRESHOLD:
-                summary['details'].append(f"📊 **Volume:** {volume_ratio:.1f}x average 🔥 (High interest)")
+                details.append(_TPL_VOLUME_HIGH % volume_ratio)
             elif volume_ratio < LOW_VOLUME_THRESHOLD:
-                summary['details'].append(f"📊 **Volume:** {volume_ratio:.1f}x average ⚠️ (Low interest)")
+                details.append(_TPL_VOLUME_LOW % volume_ratio)
         
         # Calculate overall signal
-        bullish_score = sum(strength for signal, strength, _ in signals if signal == 'BULLISH')
-        bearish_score = sum(strength for signal, strength, _ in signals if signal == 'BEARISH')
-        
         if bullish_score > bearish_score + 2:
             summary['signal'] = 'BULLISH'
             summary['strength'] = bullish_score - bearish_score
@@ -299,48 +594,19 @@ class AnalysisEngine:
         if not mtf:
             return {'score': 50, 'classification': 'NEUTRAL', 'trend': 'UNKNOWN', 'emoji': '[~]'}
 
-        # Weight different timeframes
-        weights = {
-            '1M': 0.30,   # Recent performance most important
-            '3M': 0.25,
-            '6M': 0.20,
-            '1Y': 0.15,
-            '2Y': 0.05,
-            '3Y': 0.05
-        }
-        
-        weighted_score = 0
-        total_weight = 0
-        
-        for period, weight in weights.items():
-            if period in mtf and mtf[period] is not None:
-                # Convert return to score (0-100 scale)
-                # -50% = 0, 0% = 50, +100% = 100
-                period_score = min(max((mtf[period] + 50), 0), 100)
-                weighted_score += period_score * weight
-                total_weight += weight
-        
-        if total_weight == 0:
+        returns = [mtf.get(period) for period in _MOM_PERIODS]
+        mask = np.fromiter((r is not None for r in returns), dtype=np.bool_, count=len(returns))
+        if not mask.any():
             return {'score': 50, 'classification': 'NEUTRAL', 'trend': 'UNKNOWN', 'emoji': '[~]'}
 
-        final_score = weighted_score / total_weight
-        
-        # Classify momentum
-        if final_score >= 75:
-            classification = 'STRONG_BULLISH'
-            emoji = '[++]'  # Strong bullish
-        elif final_score >= 60:
-            classification = 'BULLISH'
-            emoji = '[+]'   # Bullish
-        elif final_score >= 40:
-            classification = 'NEUTRAL'
-            emoji = '[~]'   # Neutral
-        elif final_score >= 25:
-            classification = 'BEARISH'
-            emoji = '[-]'   # Bearish
-        else:
-            classification = 'STRONG_BEARISH'
-            emoji = '[--]'   # Strong bearish
+        # Convert returns to scores (0-100 scale): -50% = 0, 0% = 50, +100% = 100
+        scores = np.clip(np.array([r for r in returns if r is not None], dtype=np.float64) + 50, 0, 100)
+        weights = _MOM_WEIGHTS[mask]
+        final_score = float((scores * weights).sum() / weights.sum())
+        
+        # Classify momentum (NaN fails every threshold, like the old if/elif chain)
+        band = int(np.searchsorted(_MOM_THRESHOLDS, final_score, side='right')) if final_score == final_score else 0
+        classification, emoji = _MOM_CLASSES[band]
         
         # Determine trend (improving vs deteriorating)
         if '1M' in mtf and '3M' in mtf and mtf['1M'] and mtf['3M']:
@@ -360,23 +626,67 @@ class AnalysisEngine:
             'trend': trend
         }
     
+    def score_momentum_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Column-wise calculate_momentum_score over many stocks
+        
+        Args:
+            df: One row per stock with 1M/3M/6M/1Y/2Y/3Y return columns
+                (NaN = missing)
+            
+        Returns:
+            DataFrame indexed like df with score, classification, emoji and trend
+        """
+        cols = df.reindex(columns=_MOM_PERIODS)
+        returns = cols.to_numpy(dtype=_frame_dtype(cols))
+        has_data = ~np.isnan(returns).all(axis=1)
+        
+        if _numba_available:
+            score = np.empty(len(df))
+            _momentum_kernel(np.ascontiguousarray(returns), _MOM_WEIGHTS, score)
+        else:
+            weights = _MOM_WEIGHTS * ~np.isnan(returns)
+            total_weight = weights.sum(axis=1)
+            weighted = (np.clip(np.nan_to_num(returns) + 50, 0, 100) * weights).sum(axis=1)
+            score = np.full(len(df), 50.0)
+            np.divide(weighted, total_weight, out=score, where=has_data)
+        
+        band = np.where(has_data, np.searchsorted(_MOM_THRESHOLDS, score, side='right'), 2)
+        classes = np.array(_MOM_CLASSES, dtype=object)
+        
+        # Trend compares 1M against 3M; either missing (or zero) leaves it UNKNOWN
+        m1, m3 = returns[:, 0], returns[:, 1]
+        with np.errstate(invalid='ignore'):
+            trend = np.select(
+                [_missing(m1) | _missing(m3), m1 > m3 * 1.2, m1 < m3 * 0.8],
+                ['UNKNOWN', 'ACCELERATING', 'DECELERATING'], 'STABLE'
+            )
+        
+        return pd.DataFrame({
+            'score': np.round(score, 1),
+            'classification': classes[band, 0],
+            'emoji': classes[band, 1],
+            'trend': trend,
+        }, index=df.index)
+    
     def generate_price_alerts(self, stock_data: Dict, backtest: Optional[Dict]) -> List[str]:
         """
         NEW FEATURE: Generate intelligent price alerts based on technical levels
         """
         alerts = []
-        price = stock_data['price']
+        sv = StockView.from_dict(stock_data)
+        price = sv.price
         
         # 52-week high/low alerts
-        if stock_data['52w_high']:
-            pct_from_high = ((price - stock_data['52w_high']) / stock_data['52w_high']) * 100
+        if sv.high_52:
+            pct_from_high = ((price - sv.high_52) / sv.high_52) * 100
             if pct_from_high > -5:
                 alerts.append(f"[HOT] Near 52W high! Only {abs(pct_from_high):.1f}% away")
             elif pct_from_high > -10:
                 alerts.append(f"[~] Approaching 52W high ({abs(pct_from_high):.1f}% away)")
         
-        if stock_data['52w_low']:
-            pct_from_low = ((price - stock_data['52w_low']) / stock_data['52w_low']) * 100
+        if sv.low_52:
+            pct_from_low = ((price - sv.low_52) / sv.low_52) * 100
             if pct_from_low < 5:
                 alerts.append(f"[!] Near 52W low! Only {pct_from_low:.1f}% above")
         
@@ -389,8 +699,8 @@ class AnalysisEngine:
                 alerts.append(f"[*] Testing 200 SMA support/resistance at ${sma_200:.2f}")
         
         # Volume alert
-        if stock_data.get('volume') and stock_data.get('avg_volume'):
-            ratio = stock_data['volume'] / stock_data['avg_volume']
+        if sv.volume and sv.avg_volume:
+            ratio = sv.volume / sv.avg_volume
             if ratio > 3:
                 alerts.append(f"[!!!] EXTREME volume! {ratio:.1f}x average - unusual activity")
             elif ratio > 2:
@@ -403,6 +713,53 @@ class AnalysisEngine:
         
         return alerts
     
+    def generate_price_alerts_frame(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Column-wise generate_price_alerts over many stocks
+        
+        Args:
+            df: One row per stock with price, 52w_high, 52w_low, sma_200, volume,
+                avg_volume and (backtest) max_drawdown columns (NaN or 0 = missing)
+            
+        Returns:
+            Series of alert lists indexed like df
+        """
+        cols = df.reindex(columns=_PRICE_ALERT_COLUMNS)
+        dtype = _frame_dtype(cols)
+        price, high, low, sma_200, volume, avg_volume, max_drawdown = (
+            cols[c].to_numpy(dtype=dtype) for c in _PRICE_ALERT_COLUMNS
+        )
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_from_high = np.where(_missing(high), np.nan, (price - high) / high * 100)
+            pct_from_low = np.where(_missing(low), np.nan, (price - low) / low * 100)
+            pct_from_200 = np.where(_missing(sma_200), np.nan, (price - sma_200) / sma_200 * 100)
+            volume_ratio = np.where(_missing(volume) | _missing(avg_volume), np.nan, volume / avg_volume)
+        
+        near_high = pct_from_high > -5
+        near_200 = (pct_from_200 > -2) & (pct_from_200 < 2)
+        extreme_volume = volume_ratio > 3
+        
+        # Only rows that fire an alert reach the string formatting; blocks run
+        # in the scalar method's order so each row's list matches it
+        alerts = [[] for _ in range(len(df))]
+        for i in np.flatnonzero(near_high):
+            alerts[i].append(f"[HOT] Near 52W high! Only {abs(pct_from_high[i]):.1f}% away")
+        for i in np.flatnonzero((pct_from_high > -10) & ~near_high):
+            alerts[i].append(f"[~] Approaching 52W high ({abs(pct_from_high[i]):.1f}% away)")
+        for i in np.flatnonzero(pct_from_low < 5):
+            alerts[i].append(f"[!] Near 52W low! Only {pct_from_low[i]:.1f}% above")
+        for i in np.flatnonzero(near_200):
+            alerts[i].append(f"[*] Testing 200 SMA support/resistance at ${sma_200[i]:.2f}")
+        for i in np.flatnonzero(extreme_volume):
+            alerts[i].append(f"[!!!] EXTREME volume! {volume_ratio[i]:.1f}x average - unusual activity")
+        for i in np.flatnonzero((volume_ratio > 2) & ~extreme_volume):
+            alerts[i].append(f"[!!] High volume: {volume_ratio[i]:.1f}x average")
+        for i in np.flatnonzero(max_drawdown < -40):
+            alerts[i].append(f"[!] Historical max drawdown: {max_drawdown[i]:.1f}% - high volatility expected")
+        
+        return pd.Series(alerts, index=df.index, dtype=object)
+    
     def calculate_risk_reward_ratio(self, stock_data: Dict, backtest: Optional[Dict]) -> Optional[Dict]:
         """
         NEW FEATURE: Calculate potential risk/reward based on historical data
@@ -410,8 +767,9 @@ class AnalysisEngine:
         if not backtest:
             return None
         
-        price_target = stock_data.get('price_target')
-        current_price = stock_data['price']
+        sv = StockView.from_dict(stock_data)
+        price_target = sv.price_target
+        current_price = sv.price
         max_drawdown = abs(backtest.get('max_drawdown', 0))
         
         if not price_target or price_target <= 0:
@@ -743,16 +1101,7 @@ class AnalysisEngine:
         if num is None or num == 'N/A':
             return 'N/A'
         if isinstance(num, (int, float)):
-            if num >= 1e12:
-                return f"${num/1e12:.2f}T"
-            elif num >= 1e9:
-                return f"${num/1e9:.2f}B"
-            elif num >= 1e6:
-                return f"${num/1e6:.2f}M"
-            elif num >= 1e3:
-                return f"${num/1e3:.2f}K"
-            else:
-                return f"${num:,.2f}"
+            return _format_money(num)
         return str(num)
     
     def format_percent(self, num):
@@ -762,3 +1111,35 @@ class AnalysisEngine:
         if isinstance(num, (int, float)):
             return f"{num*100:.2f}%"
         return str(num)
+    
+    def format_number_array(self, values) -> np.ndarray:
+        """
+        Vector form of format_number for a numeric column
+        
+        Args:
+            values: Array-like of numbers; NaN (a missing frame cell) gives 'N/A'
+            
+        Returns:
+            Object array of strings, same shape as values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        out = np.full(values.shape, 'N/A', dtype=object)
+        with np.errstate(invalid='ignore'):
+            band = np.where(values >= 1e3, np.searchsorted(_MONEY_BOUNDS, values, side='right'), 0)
+        
+        # Format per magnitude band (five passes), never per-element type checks
+        small = (band == 0) & ~np.isnan(values)
+        out[small] = [f"${v:,.2f}" for v in values[small].tolist()]
+        for b, (divisor, suffix) in enumerate(_MONEY_SCALES, start=1):
+            mask = band == b
+            if mask.any():
+                out[mask] = [f"${v:.2f}{suffix}" for v in (values[mask] / divisor).tolist()]
+        return out
+    
+    def format_percent_array(self, values) -> np.ndarray:
+        """Vector form of format_percent; NaN gives 'N/A'"""
+        values = np.asarray(values, dtype=np.float64)
+        out = np.full(values.shape, 'N/A', dtype=object)
+        present = ~np.isnan(values)
+        out[present] = [f"{v:.2f}%" for v in (values[present] * 100).tolist()]
+        return out
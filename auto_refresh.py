@@ -4,15 +4,105 @@ Handles automatic dashboard updates at configurable intervals
 """
 
 import asyncio
+import heapq
+import math
+import time
+import sqlite3
 import discord
-from discord.ext import tasks
-from typing import Optional, Dict
-from datetime import datetime, timedelta
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, List, Set, Tuple
+from datetime import datetime
 
 from database import DatabaseManager
 from channel_manager import ChannelManager
 
 
+# Overview embed queries, kept as constants so sqlite3's statement cache
+# reuses their compiled plans across refreshes
+_SQL_ACTIVE_COUNT = 'SELECT COUNT(*) FROM stock_tracking WHERE status = "tracking"'
+
+_SQL_ACTIVE_DASHBOARDS = 'SELECT COUNT(*) FROM dashboard_state WHERE auto_refresh = 1'
+
+_SQL_DASHBOARD_INTERVALS = 'SELECT channel_id, refresh_interval FROM dashboard_state WHERE auto_refresh = 1'
+
+_SQL_RECENT_ALERTS = '''SELECT ticker, alert_type, confidence
+                        FROM alert_log ORDER BY alert_date DESC LIMIT 5'''
+
+_SQL_SNAPSHOT_TRACKING = '''SELECT ticker, price_change_pct, current_price
+                            FROM stock_tracking WHERE status = "tracking"'''
+
+# Top 5 gainers (side 0, best first) then top 5 losers (side 1, worst first)
+_SQL_TOP_MOVERS = '''SELECT * FROM (SELECT 0, ticker, price_change_pct, current_price
+                                    FROM stock_tracking WHERE status = "tracking"
+                                    ORDER BY price_change_pct DESC LIMIT 5)
+                     UNION ALL
+                     SELECT * FROM (SELECT 1, ticker, price_change_pct, current_price
+                                    FROM stock_tracking WHERE status = "tracking"
+                                    ORDER BY price_change_pct ASC LIMIT 5)'''
+
+# Overview field line templates (str.format over a query row)
+_ALERT_LINE = "**{0}**: {1} ({2:.0%})"
+_GAINER_LINE = "**{0}**: +{1:.2f}% @ ${2:.2f}"
+_LOSER_LINE = "**{0}**: {1:.2f}% @ ${2:.2f}"
+
+
+@lru_cache(maxsize=64)
+def _format_lines(template: str, rows: Tuple[tuple, ...]) -> str:
+    """Render one embed field from query rows; unchanged rows reuse the string"""
+    return '\n'.join([template.format(*row) for row in rows])
+
+
+@dataclass(slots=True, frozen=True)
+class MarketSnapshot:
+    """In-memory copy of the data behind the overview embed
+    
+    Tracked stocks are held as parallel arrays so the top movers come from an
+    argpartition instead of two sorted queries.
+    """
+    tickers: np.ndarray
+    price_change_pct: np.ndarray
+    current_price: np.ndarray
+    recent_alerts: Tuple[tuple, ...]
+    
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> 'MarketSnapshot':
+        """Read the tracked stocks and latest alerts from the database"""
+        rows = conn.execute(_SQL_SNAPSHOT_TRACKING).fetchall()
+        recent_alerts = tuple(conn.execute(_SQL_RECENT_ALERTS).fetchall())
+        if rows:
+            tickers, changes, prices = zip(*rows)
+        else:
+            tickers, changes, prices = (), (), ()
+        return cls(
+            tickers=np.array(tickers, dtype=object),
+            price_change_pct=np.array(changes, dtype=np.float64),
+            current_price=np.array(prices, dtype=np.float64),
+            recent_alerts=recent_alerts,
+        )
+    
+    @property
+    def active_count(self) -> int:
+        return len(self.tickers)
+    
+    def top_movers(self, k: int = 5) -> Tuple[List[tuple], List[tuple]]:
+        """(top k gainers best first, top k losers worst first); NULL changes are skipped"""
+        valid = np.flatnonzero(~np.isnan(self.price_change_pct))
+        if not valid.size:
+            return [], []
+        changes = self.price_change_pct[valid]
+        k = min(k, valid.size)
+        
+        def rows(order):
+            return [(self.tickers[i], self.price_change_pct[i], self.current_price[i]) for i in valid[order]]
+        
+        best = np.argpartition(-changes, k - 1)[:k]
+        worst = np.argpartition(changes, k - 1)[:k]
+        return (rows(best[np.argsort(-changes[best], kind='stable')]),
+                rows(worst[np.argsort(changes[worst], kind='stable')]))
+
+
 class AutoRefreshManager:
     """Manages automatic dashboard refreshing"""
     
@@ -20,25 +110,101 @@ class AutoRefreshManager:
         self.bot = bot
         self.channel_manager = channel_manager
         self.db = db
-        self._refresh_task: Optional[tasks.Loop] = None
+        self._refresh_task: Optional[asyncio.Task] = None
         self._running = False
-        self._refresh_interval = 60  # seconds (safer for Discord rate limits)
-        self._last_interaction: datetime = datetime.now()
+        self._refresh_interval = 60  # seconds; default for channels without their own interval
+        # Per-channel schedule: heap of (due time, channel_id). _next_due holds
+        # each channel's current due time; heap entries that disagree with it
+        # are stale and skipped when popped
+        self._schedule: List[Tuple[float, str]] = []
+        self._next_due: Dict[str, float] = {}
+        self._intervals: Dict[str, int] = {}
+        self._schedule_changed: Optional[asyncio.Event] = None
+        self._last_interaction: float = time.monotonic()
         self._interaction_lock = False
-        self._last_error_time: datetime = None
+        self._last_error_time: float = 0.0
         self._error_count = 0
         self._rate_limited = False
         self._rate_limit_retry_after = 0
+        self._max_edit_concurrency = 5
+        self._edit_concurrency = self._max_edit_concurrency
+        # channel_id -> (pinned message id, embed hash) of the last successful edit
+        self._last_embed_hash: Dict[str, Tuple[str, int]] = {}
+        # channel_id (as stored in dashboard_state) -> resolved channel object
+        self._channel_cache: Dict[str, discord.abc.Messageable] = {}
+        # Number of auto-refresh dashboards; None until first counted. Other
+        # code paths (button handlers) toggle auto_refresh directly, so the
+        # count is re-read from the DB at most every _dashboard_count_ttl seconds
+        self._active_dashboard_count: Optional[int] = None
+        self._dashboard_count_at = 0.0
+        self._dashboard_count_ttl = 300.0
+        # Long-lived embeds for the shared views, refilled in place each cycle.
+        # message.edit serializes the embed before its first await, so reusing
+        # the object across channels and cycles is safe on the event loop
+        self._overview_embed = discord.Embed(title="Market Overview", color=0x00ff00)
+        # Overview data kept in memory; reloaded only when another connection
+        # has committed to the database (PRAGMA data_version changed)
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._snapshot_version: Optional[int] = None
+        self._watch_conn: Optional[sqlite3.Connection] = None
+        self._settings_embed = discord.Embed(
+            title="Dashboard Settings",
+            description="Configure dashboard options",
+            color=0xffaa00
+        )
+        self._settings_embed.add_field(name="Auto-Refresh", value="Enabled", inline=False)
+        self._settings_embed.add_field(name="Interval", value="30 seconds", inline=True)
+        self._settings_embed.add_field(name="Status", value="Active", inline=True)
+        if hasattr(bot, 'add_listener'):
+            bot.add_listener(self._on_guild_channel_delete, 'on_guild_channel_delete')
+    
+    def _get_channel(self, channel_id: str):
+        """Resolve a dashboard channel, reusing the object from earlier cycles"""
+        channel = self._channel_cache.get(channel_id)
+        if channel is None:
+            channel = self.bot.get_channel(int(channel_id))
+            if channel is not None:
+                self._channel_cache[channel_id] = channel
+        return channel
     
-    def record_interaction(self):
-        """Record that a user is interacting with the dashboard"""
-        self._last_interaction = datetime.now()
+    def forget_channel(self, channel_id: str):
+        """Drop cached state for a channel that was deleted or became unreachable"""
+        self._channel_cache.pop(str(channel_id), None)
+        self._last_embed_hash.pop(str(channel_id), None)
+    
+    async def _on_guild_channel_delete(self, channel):
+        """Bot listener: invalidate the channel cache when a channel is deleted"""
+        self.forget_channel(channel.id)
+    
+    def record_interaction(self, channel_id: Optional[str] = None):
+        """Record that a user is interacting with the dashboard
+        
+        Args:
+            channel_id: Channel whose pinned message the interaction edited;
+                None if unknown, which forgets every channel's last edit
+        """
+        self._last_interaction = time.monotonic()
         self._interaction_lock = False  # Release lock when interaction recorded
+        self._forget_last_edit(channel_id)
     
-    def acquire_lock(self):
-        """Acquire interaction lock - call before processing interactions"""
+    def acquire_lock(self, channel_id: Optional[str] = None):
+        """Acquire interaction lock - call before processing interactions
+        
+        Args:
+            channel_id: Channel whose pinned message the interaction will edit;
+                None if unknown, which forgets every channel's last edit
+        """
         self._interaction_lock = True
-        self._last_interaction = datetime.now()
+        self._last_interaction = time.monotonic()
+        self._forget_last_edit(channel_id)
+    
+    def _forget_last_edit(self, channel_id: Optional[str]):
+        """Button handlers edit the pinned message too, so the next refresh must
+        not skip its edit just because our own last embed is unchanged"""
+        if channel_id is None:
+            self._last_embed_hash.clear()
+        else:
+            self._last_embed_hash.pop(str(channel_id), None)
     
     def release_lock(self):
         """Release interaction lock - call after processing interactions"""
@@ -49,13 +215,13 @@ class AutoRefreshManager:
         # Don't refresh if lock is acquired (user interacting)
         if self._interaction_lock:
             return False
+        now = time.monotonic()
         # Don't refresh if user interacted recently (within 3 seconds)
-        if datetime.now() - self._last_interaction < timedelta(seconds=3):
+        if now - self._last_interaction < 3.0:
             return False
         # If we've been rate limited recently, skip this cycle
         if self._rate_limited:
-            time_since_error = datetime.now() - self._last_error_time
-            if time_since_error < timedelta(seconds=self._rate_limit_retry_after + 10):
+            if now - self._last_error_time < self._rate_limit_retry_after + 10:
                 return False
             # Reset rate limit after waiting
             self._rate_limited = False
@@ -64,8 +230,9 @@ class AutoRefreshManager:
     def _on_rate_limit(self, retry_after: int):
         """Called when we hit a rate limit"""
         self._rate_limited = True
-        self._last_error_time = datetime.now()
+        self._last_error_time = time.monotonic()
         self._rate_limit_retry_after = retry_after
+        self._edit_concurrency = max(1, self._edit_concurrency // 2)
         print(f"[AutoRefresh] Rate limited! Pausing for {retry_after} seconds")
     
     def start(self):
@@ -75,7 +242,9 @@ class AutoRefreshManager:
         
         print("[AutoRefresh] Starting auto-refresh manager")
         self._running = True
-        self._refresh_loop.start()
+        self._schedule_changed = asyncio.Event()
+        self._sync_schedule()
+        self._refresh_task = asyncio.ensure_future(self._scheduler())
     
     def stop(self):
         """Stop the auto-refresh loop"""
@@ -89,13 +258,106 @@ class AutoRefreshManager:
             self._refresh_task.cancel()
             self._refresh_task = None
     
-    @tasks.loop(seconds=60)
-    async def _refresh_loop(self):
-        """Main auto-refresh loop"""
-        try:
-            await self.refresh_all_dashboards()
-        except Exception as e:
-            print(f"[AutoRefresh] Error in refresh loop: {e}")
+    def _clamp_interval(self, interval: Optional[int]) -> int:
+        """Channel refresh interval in seconds, bounded like refresh_interval"""
+        if not interval:
+            return self._refresh_interval
+        return max(10, min(300, int(interval)))
+    
+    def _schedule_channel(self, channel_id: str, due: float):
+        """(Re)schedule a channel's next refresh and wake the scheduler"""
+        self._next_due[channel_id] = due
+        heapq.heappush(self._schedule, (due, channel_id))
+        if self._schedule_changed is not None:
+            self._schedule_changed.set()
+    
+    def _unschedule_channel(self, channel_id: str):
+        """Stop refreshing a channel; its heap entries become stale"""
+        self._next_due.pop(channel_id, None)
+        self._intervals.pop(channel_id, None)
+    
+    def _sync_schedule(self):
+        """Reconcile the schedule with dashboard_state
+        
+        New auto-refresh channels are due immediately, disabled ones are
+        dropped and interval changes apply from the next refresh. Also
+        refreshes the active dashboard count.
+        """
+        with self.db.read_connection() as conn:
+            rows = conn.execute(_SQL_DASHBOARD_INTERVALS).fetchall()
+        
+        now = time.monotonic()
+        active = set()
+        for channel_id, interval in rows:
+            active.add(channel_id)
+            self._intervals[channel_id] = self._clamp_interval(interval)
+            if channel_id not in self._next_due:
+                self._schedule_channel(channel_id, now)
+        for channel_id in list(self._next_due):
+            if channel_id not in active:
+                self._unschedule_channel(channel_id)
+        
+        self._active_dashboard_count = len(rows)
+        self._dashboard_count_at = now
+    
+    def _pop_due(self, now: float) -> Set[str]:
+        """Remove and return every channel whose refresh is due"""
+        due = set()
+        while self._schedule and self._schedule[0][0] <= now:
+            ts, channel_id = heapq.heappop(self._schedule)
+            if self._next_due.get(channel_id) == ts:
+                due.add(channel_id)
+        return due
+    
+    def _next_wakeup(self) -> Optional[float]:
+        """Due time of the earliest scheduled channel, discarding stale entries"""
+        while self._schedule:
+            ts, channel_id = self._schedule[0]
+            if self._next_due.get(channel_id) == ts:
+                return ts
+            heapq.heappop(self._schedule)
+        return None
+    
+    async def _scheduler(self):
+        """Main auto-refresh loop: sleep until the next channel is due, then
+        refresh every due channel as one batch"""
+        while self._running:
+            try:
+                now = time.monotonic()
+                if now - self._dashboard_count_at >= self._dashboard_count_ttl:
+                    # Pick up dashboards enabled/disabled outside this manager
+                    self._sync_schedule()
+                
+                next_due = self._next_wakeup()
+                resync_at = self._dashboard_count_at + self._dashboard_count_ttl
+                wake_at = resync_at if next_due is None else min(next_due, resync_at)
+                if wake_at > now:
+                    self._schedule_changed.clear()
+                    try:
+                        await asyncio.wait_for(self._schedule_changed.wait(), wake_at - now)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                # User interacting or rate limited: try again shortly
+                if not self._should_refresh():
+                    await asyncio.sleep(3)
+                    continue
+                
+                due = self._pop_due(now)
+                if due:
+                    with self.db.read_connection() as conn:
+                        await self._refresh_channels(conn, due)
+                    done = time.monotonic()
+                    for channel_id in due:
+                        if channel_id in self._intervals:
+                            self._schedule_channel(channel_id, done + self._intervals[channel_id])
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[AutoRefresh] Error in refresh loop: {e}")
+                await asyncio.sleep(5)
     
     async def refresh_all_dashboards(self):
         """Refresh all active dashboard channels"""
@@ -103,7 +365,34 @@ class AutoRefreshManager:
         if not self._should_refresh():
             return
         
-        conn = self.db.get_connection()
+        # Nothing has auto-refresh enabled: skip the DB entirely
+        if self._count_active_dashboards() == 0:
+            return
+        
+        with self.db.read_connection() as conn:
+            await self._refresh_channels(conn)
+    
+    def _count_active_dashboards(self, force: bool = False) -> int:
+        """Cached number of dashboards with auto-refresh enabled
+        
+        Args:
+            force: Re-read the count even if the cached value is still fresh
+        """
+        now = time.monotonic()
+        if (force or self._active_dashboard_count is None
+                or now - self._dashboard_count_at >= self._dashboard_count_ttl):
+            with self.db.read_connection() as conn:
+                self._active_dashboard_count = conn.execute(_SQL_ACTIVE_DASHBOARDS).fetchone()[0]
+            self._dashboard_count_at = now
+        return self._active_dashboard_count
+    
+    async def _refresh_channels(self, conn, only: Optional[Set[str]] = None):
+        """Refresh auto-refresh channels using one pooled connection
+        
+        Args:
+            conn: Pooled read connection
+            only: Restrict the refresh to these channel ids (all when None)
+        """
         c = conn.cursor()
         
         try:
@@ -112,59 +401,123 @@ class AutoRefreshManager:
                          FROM dashboard_state WHERE auto_refresh = 1''')
             
             channels = c.fetchall()
+            if only is not None:
+                channels = [row for row in channels if row[0] in only]
             
             if not channels:
                 return
             
             print(f"[AutoRefresh] Refreshing {len(channels)} dashboards")
             
-            for channel_id, current_view, current_ticker, refresh_interval, auto_refresh in channels:
-                if not auto_refresh:
-                    continue
-                
-                try:
-                    # Get channel from bot
-                    channel = self.bot.get_channel(int(channel_id))
-                    
-                    if not channel:
-                        continue
-                    
-                    # Find pinned message
-                    state = self.channel_manager.get_channel_state(channel_id)
-                    pinned_msg_id = state.get('pinned_message_id')
-                    
-                    if not pinned_msg_id:
-                        continue
-                    
-                    # Fetch and update message
-                    try:
-                        message = await channel.fetch_message(int(pinned_msg_id))
-                        
-                        # Generate fresh embed based on view
-                        if current_view == 'overview':
-                            embed = await self._generate_overview_embed()
-                        elif current_view == 'ticker' and current_ticker:
-                            embed = await self._generate_ticker_embed(current_ticker)
-                        elif current_view == 'settings':
-                            embed = await self._generate_settings_embed()
-                        else:
-                            embed = await self._generate_overview_embed()
-                        
-                        await message.edit(embed=embed)
-                        
-                    except discord.NotFound:
-                        # Message deleted, need to recreate
-                        print(f"[AutoRefresh] Message not found for channel {channel_id}")
-                    except discord.Forbidden:
-                        print(f"[AutoRefresh] No permission in channel {channel_id}")
-                    
-                except Exception as e:
-                    print(f"[AutoRefresh] Error refreshing channel {channel_id}: {e}")
+            # Edit dashboards concurrently, bounded so a burst of edits stays
+            # under Discord's rate limits
+            sem = asyncio.Semaphore(self._edit_concurrency)
+            embed_cache: Dict[Tuple[str, Optional[str]], discord.Embed] = {}
+            await asyncio.gather(*(self._refresh_one(sem, conn, row, embed_cache) for row in channels),
+                                 return_exceptions=True)
+            
+            # Additive increase after a clean cycle; _on_rate_limit halves it
+            if not self._rate_limited:
+                self._edit_concurrency = min(self._max_edit_concurrency, self._edit_concurrency + 1)
             
         except Exception as e:
             print(f"[AutoRefresh] Error: {e}")
-        finally:
-            conn.close()
+    
+    async def _refresh_one(self, sem: asyncio.Semaphore, conn, row,
+                           embed_cache: Dict[Tuple[str, Optional[str]], discord.Embed]):
+        """Refresh one dashboard channel from its dashboard_state row
+        
+        Args:
+            sem: Semaphore bounding concurrent Discord edits
+            conn: Pooled connection shared by this refresh cycle
+            row: dashboard_state row for the channel
+            embed_cache: Embeds already built this cycle, keyed by (view, ticker)
+        """
+        channel_id, current_view, current_ticker, refresh_interval, auto_refresh = row
+        if not auto_refresh:
+            return
+        
+        async with sem:
+            # Another edit in this cycle hit a rate limit; leave the rest for later
+            if self._rate_limited:
+                return
+            
+            try:
+                # Get channel from bot
+                channel = self._get_channel(channel_id)
+                
+                if not channel:
+                    return
+                
+                # Find pinned message
+                state = self.channel_manager.get_channel_state(channel_id)
+                pinned_msg_id = state.get('pinned_message_id')
+                
+                if not pinned_msg_id:
+                    return
+                
+                # Generate fresh embed based on view, once per view per cycle
+                if current_view == 'ticker' and current_ticker:
+                    key = ('ticker', current_ticker.upper())
+                elif current_view == 'settings':
+                    key = ('settings', None)
+                else:
+                    key = ('overview', None)
+                
+                embed = embed_cache.get(key)
+                if embed is None:
+                    if key[0] == 'ticker':
+                        embed = await self._generate_ticker_embed(current_ticker, conn)
+                    elif key[0] == 'settings':
+                        embed = await self._generate_settings_embed()
+                    else:
+                        embed = await self._generate_overview_embed(conn)
+                    embed_cache[key] = embed
+                
+                # Nothing changed since the last edit: skip both API calls
+                content = (pinned_msg_id, self._embed_hash(embed))
+                if self._last_embed_hash.get(channel_id) == content:
+                    return
+                
+                # Fetch and update message
+                try:
+                    message = await channel.fetch_message(int(pinned_msg_id))
+                    await message.edit(embed=embed)
+                    self._last_embed_hash[channel_id] = content
+                    
+                except discord.NotFound:
+                    # Message deleted, need to recreate
+                    print(f"[AutoRefresh] Message not found for channel {channel_id}")
+                    self.forget_channel(channel_id)
+                except discord.Forbidden:
+                    print(f"[AutoRefresh] No permission in channel {channel_id}")
+                    self.forget_channel(channel_id)
+                except discord.HTTPException as e:
+                    if e.status != 429:
+                        raise
+                    self._on_rate_limit(self._retry_after(e))
+                
+            except Exception as e:
+                print(f"[AutoRefresh] Error refreshing channel {channel_id}: {e}")
+    
+    @staticmethod
+    def _embed_hash(embed: discord.Embed) -> int:
+        """Hash of an embed's rendered content, ignoring its timestamp"""
+        payload = embed.to_dict()
+        payload.pop('timestamp', None)
+        return hash(repr(payload))
+    
+    @staticmethod
+    def _retry_after(error: discord.HTTPException) -> int:
+        """Seconds Discord asked us to wait, from the exception or its response"""
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is None:
+            headers = getattr(error.response, 'headers', None) or {}
+            try:
+                retry_after = float(headers.get('Retry-After', 1))
+            except (TypeError, ValueError):
+                retry_after = 1
+        return max(1, int(math.ceil(retry_after)))
     
     async def refresh_single_dashboard(self, channel_id: str):
         """Refresh a single dashboard channel
@@ -173,7 +526,7 @@ class AutoRefreshManager:
             channel_id: Discord channel ID
         """
         try:
-            channel = self.bot.get_channel(int(channel_id))
+            channel = self._get_channel(channel_id)
             
             if not channel:
                 return False
@@ -200,59 +553,85 @@ class AutoRefreshManager:
                     embed = await self._generate_overview_embed()
                 
                 await message.edit(embed=embed)
+                self._last_embed_hash[channel_id] = (pinned_msg_id, self._embed_hash(embed))
                 return True
                 
             except (discord.NotFound, discord.Forbidden):
+                self.forget_channel(channel_id)
                 return False
                 
         except Exception as e:
             print(f"[AutoRefresh] Error refreshing dashboard: {e}")
             return False
     
-    async def _generate_overview_embed(self) -> discord.Embed:
-        """Generate overview embed data"""
-        embed = discord.Embed(
-            title="Market Overview",
-            description="Real-time market analysis",
-            color=0x00ff00,
-            timestamp=datetime.now()
-        )
+    def update_snapshot(self, conn: Optional[sqlite3.Connection] = None):
+        """Reload the overview snapshot; writers may call this after updating
+        stock_tracking or alert_log to publish the change immediately"""
+        if conn is None:
+            with self.db.read_connection() as conn:
+                self._snapshot = MarketSnapshot.load(conn)
+        else:
+            self._snapshot = MarketSnapshot.load(conn)
+    
+    def _current_snapshot(self, conn: sqlite3.Connection) -> Optional[MarketSnapshot]:
+        """Overview snapshot, reloaded first if the database changed since"""
+        try:
+            if self._watch_conn is None:
+                self._watch_conn = sqlite3.connect(self.db.db_path, timeout=30.0)
+            # Read the version before loading so a commit in between is seen next time
+            version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._snapshot is None or version != self._snapshot_version:
+                self.update_snapshot(conn)
+                self._snapshot_version = version
+        except Exception as e:
+            print(f"[AutoRefresh] Error loading overview snapshot: {e}")
+            self._snapshot = None
+        return self._snapshot
+    
+    async def _generate_overview_embed(self, conn: Optional[sqlite3.Connection] = None) -> discord.Embed:
+        """Generate overview embed data
         
-        conn = self.db.get_connection()
-        c = conn.cursor()
+        Args:
+            conn: Pooled connection to query with; one is borrowed if omitted
+        """
+        if conn is None:
+            with self.db.read_connection() as conn:
+                return await self._generate_overview_embed(conn)
+        
+        # Reuse the long-lived overview embed: reset its body and refill it
+        embed = self._overview_embed
+        embed.description = "Real-time market analysis"
+        embed.timestamp = datetime.now()
+        embed.clear_fields()
         
         try:
-            # Get active tracking count
-            c.execute('SELECT COUNT(*) FROM stock_tracking WHERE status = "tracking"')
-            active_count = c.fetchone()[0]
-            
-            # Get recent alerts
-            c.execute('''SELECT ticker, alert_type, confidence 
-                         FROM alert_log ORDER BY alert_date DESC LIMIT 5''')
-            recent_alerts = c.fetchall()
-            
-            # Get top gainers
-            c.execute('''SELECT ticker, price_change_pct, current_price
-                         FROM stock_tracking WHERE status = "tracking"
-                         ORDER BY price_change_pct DESC LIMIT 5''')
-            top_gainers = c.fetchall()
-            
-            # Get top losers
-            c.execute('''SELECT ticker, price_change_pct, current_price
-                         FROM stock_tracking WHERE status = "tracking"
-                         ORDER BY price_change_pct ASC LIMIT 5''')
-            top_losers = c.fetchall()
+            snapshot = self._current_snapshot(conn)
+            if snapshot is not None:
+                active_count = snapshot.active_count
+                recent_alerts = snapshot.recent_alerts
+                top_gainers, top_losers = snapshot.top_movers()
+            else:
+                # Get active tracking count
+                active_count = conn.execute(_SQL_ACTIVE_COUNT).fetchone()[0]
+                
+                # Get recent alerts
+                recent_alerts = conn.execute(_SQL_RECENT_ALERTS).fetchall()
+                
+                # Get top gainers and losers in one round-trip
+                top_gainers, top_losers = [], []
+                for side, ticker, change, price in conn.execute(_SQL_TOP_MOVERS):
+                    (top_gainers if side == 0 else top_losers).append((ticker, change, price))
             
             if recent_alerts:
-                alerts_text = '\n'.join([f"**{row[0]}**: {row[1]} ({row[2]:.0%})" for row in recent_alerts])
+                alerts_text = _format_lines(_ALERT_LINE, tuple(recent_alerts))
                 embed.add_field(name="Recent Alerts", value=alerts_text, inline=False)
             
             if top_gainers:
-                gainers_text = '\n'.join([f"**{row[0]}**: +{row[1]:.2f}% @ ${row[2]:.2f}" for row in top_gainers])
+                gainers_text = _format_lines(_GAINER_LINE, tuple(top_gainers))
                 embed.add_field(name="Top Gainers", value=gainers_text, inline=True)
             
             if top_losers:
-                losers_text = '\n'.join([f"**{row[0]}**: {row[1]:.2f}% @ ${row[2]:.2f}" for row in top_losers])
+                losers_text = _format_lines(_LOSER_LINE, tuple(top_losers))
                 embed.add_field(name="Top Losers", value=losers_text, inline=True)
             
             embed.add_field(name="Active Tracking", value=f"{active_count} stocks", inline=False)
@@ -261,13 +640,21 @@ class AutoRefreshManager:
         except Exception as e:
             print(f"[AutoRefresh] Error generating overview: {e}")
             embed.description = "Error loading market data"
-        finally:
-            conn.close()
         
         return embed
     
-    async def _generate_ticker_embed(self, ticker: str) -> discord.Embed:
-        """Generate ticker embed data"""
+    async def _generate_ticker_embed(self, ticker: str,
+                                     conn: Optional[sqlite3.Connection] = None) -> discord.Embed:
+        """Generate ticker embed data
+        
+        Args:
+            ticker: Stock ticker symbol
+            conn: Pooled connection to query with; one is borrowed if omitted
+        """
+        if conn is None:
+            with self.db.read_connection() as conn:
+                return await self._generate_ticker_embed(ticker, conn)
+        
         embed = discord.Embed(
             title=f"{ticker.upper()} Analysis",
             description="Detailed stock analysis",
@@ -275,7 +662,6 @@ class AutoRefreshManager:
             timestamp=datetime.now()
         )
         
-        conn = self.db.get_connection()
         c = conn.cursor()
         
         try:
@@ -301,24 +687,13 @@ class AutoRefreshManager:
         except Exception as e:
             print(f"[AutoRefresh] Error generating ticker embed: {e}")
             embed.description = "Error loading ticker data"
-        finally:
-            conn.close()
         
         return embed
     
     async def _generate_settings_embed(self) -> discord.Embed:
-        """Generate settings embed data"""
-        embed = discord.Embed(
-            title="Dashboard Settings",
-            description="Configure dashboard options",
-            color=0xffaa00,
-            timestamp=datetime.now()
-        )
-        
-        embed.add_field(name="Auto-Refresh", value="Enabled", inline=False)
-        embed.add_field(name="Interval", value="30 seconds", inline=True)
-        embed.add_field(name="Status", value="Active", inline=True)
-        
+        """Generate settings embed data (static content; only the timestamp changes)"""
+        embed = self._settings_embed
+        embed.timestamp = datetime.now()
         return embed
     
     def update_refresh_interval(self, channel_id: str, interval: int):
@@ -329,6 +704,12 @@ class AutoRefreshManager:
             interval: New interval in seconds
         """
         self.channel_manager.update_channel_state(channel_id, refresh_interval=interval)
+        if channel_id in self._next_due:
+            # Apply a shorter interval right away rather than after the old one
+            interval = self._clamp_interval(interval)
+            self._intervals[channel_id] = interval
+            due = min(self._next_due[channel_id], time.monotonic() + interval)
+            self._schedule_channel(channel_id, due)
         print(f"[AutoRefresh] Updated interval for channel {channel_id} to {interval}s")
     
     def set_channel_auto_refresh(self, channel_id: str, enabled: bool):
@@ -339,6 +720,10 @@ class AutoRefreshManager:
             enabled: True to enable, False to disable
         """
         self.channel_manager.update_channel_state(channel_id, auto_refresh=enabled)
+        if self._running:
+            self._sync_schedule()
+        else:
+            self._count_active_dashboards(force=True)
         status = "enabled" if enabled else "disabled"
         print(f"[AutoRefresh] Auto-refresh {status} for channel {channel_id}")
     
@@ -356,5 +741,3 @@ class AutoRefreshManager:
     def refresh_interval(self, value: int):
         """Set refresh interval"""
         self._refresh_interval = max(10, min(300, value))
-        if self._refresh_task:
-            self._refresh_task.change_interval(seconds=self._refresh_interval)
@@ -2,22 +2,367 @@
 Enhanced Backtesting Module - Track historical performance with detailed metrics
 """
 
+import asyncio
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
 import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from config import DB_PATH, WINNER_THRESHOLD, LOSER_THRESHOLD
 import statistics
 
+try:
+    from curl_cffi import requests as curl_requests
+    _curl_available = True
+except ImportError:
+    _curl_available = False
+
+
+_CREATE_TABLE_SQL = '''CREATE TABLE IF NOT EXISTS backtest_results
+                       (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        ticker TEXT,
+                        backtest_date TEXT,
+                        period_years INTEGER,
+                        total_return REAL,
+                        annualized_return REAL,
+                        volatility REAL,
+                        sharpe_ratio REAL,
+                        sortino_ratio REAL,
+                        calmar_ratio REAL,
+                        max_drawdown REAL,
+                        win_rate REAL,
+                        profit_factor REAL,
+                        alpha REAL,
+                        beta REAL,
+                        spy_return REAL,
+                        excess_return REAL,
+                        UNIQUE(ticker, period_years, backtest_date))'''
+# The UNIQUE index is both the hourly-bucket dedupe key and the lookup
+# index for _LATEST_RESULT_SQL
+
+_INSERT_SQL = '''INSERT OR REPLACE INTO backtest_results
+                 (ticker, backtest_date, period_years, total_return, annualized_return,
+                  volatility, sharpe_ratio, sortino_ratio, calmar_ratio, max_drawdown,
+                  win_rate, profit_factor, alpha, beta, spy_return, excess_return)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+
+# Tables created before period_years joined the UNIQUE constraint are rebuilt
+# once, since SQLite cannot drop a table constraint in place
+_TABLE_DEF_SQL = "SELECT sql FROM sqlite_master WHERE type='table' AND name='backtest_results'"
+_MIGRATE_SQL = (
+    "ALTER TABLE backtest_results RENAME TO backtest_results_old",
+    _CREATE_TABLE_SQL,
+    "INSERT OR REPLACE INTO backtest_results SELECT * FROM backtest_results_old ORDER BY id",
+    "DROP TABLE backtest_results_old",
+    "DROP INDEX IF EXISTS idx_backtest_ticker_date",
+)
+
+# Metric columns read back from backtest_results, in SELECT order
+_RESULT_COLUMNS = ('period_years', 'total_return', 'annualized_return', 'volatility',
+                   'sharpe_ratio', 'sortino_ratio', 'calmar_ratio', 'max_drawdown',
+                   'win_rate', 'profit_factor', 'alpha', 'beta', 'spy_return',
+                   'excess_return')
+
+_LATEST_RESULT_SQL = (f"SELECT backtest_date, {', '.join(_RESULT_COLUMNS)} FROM backtest_results "
+                      "WHERE ticker = ? AND period_years = ? "
+                      "ORDER BY backtest_date DESC LIMIT 1")
+
+_PRUNE_SQL = "DELETE FROM backtest_results WHERE backtest_date < ?"
+
+# Stored backtests younger than this are served without recomputing
+_BACKTEST_FRESH_HOURS = 6
+# Stored backtests older than this are deleted at startup
+_BACKTEST_RETENTION_DAYS = 30
+
+
+# Shared worker pool for the *_async wrappers: yfinance downloads and pandas
+# parsing block for seconds, so they run here instead of on the event loop
+_BACKTEST_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='backtest')
+
+_HISTORY_CACHE_SIZE = 256
+_HISTORY_BUCKET_SECONDS = 300
+_history_cache: OrderedDict = OrderedDict()
+_history_lock = threading.Lock()
+_EMPTY_HISTORY = (np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype=np.float32))
+
+
+def _history_arrays(hist) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack a yfinance history frame into read-only (dates, closes) arrays
+    
+    Closes are stored as float32: half the cache footprint and memory traffic,
+    and quote precision is far below float32's ~7 significant digits.
+    """
+    hist = hist.dropna(subset=['Close'])
+    index = hist.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    dates = index.values.astype('datetime64[ns]')
+    closes = hist['Close'].to_numpy(dtype=np.float32, copy=True)
+    dates.flags.writeable = False
+    closes.flags.writeable = False
+    return dates, closes
+
+
+def _fetch_histories(symbols: List[str], days: int,
+                     session=None) -> Tuple[datetime, List[Tuple[np.ndarray, np.ndarray]]]:
+    """Daily close history for each symbol over the last `days` days
+    
+    Results are cached per (symbol, start, end) with the end rounded down to
+    a 5 minute bucket, so repeated lookups for the same ticker (dashboard,
+    ticker report, risk metrics) share one download. Symbols missing from the
+    cache are fetched together in a single yf.download call.
+    
+    Args:
+        symbols: Tickers to fetch
+        days: Window length in calendar days
+        session: HTTP session handed to yfinance so connections are reused
+    
+    Returns:
+        (window end, [(datetime64[ns] dates, float32 closes), ...]) in symbol order;
+        a symbol with no data gets empty arrays
+    """
+    now = datetime.now()
+    end_date = now - timedelta(seconds=now.timestamp() % _HISTORY_BUCKET_SECONDS)
+    start_date = end_date - timedelta(days=days)
+    start_iso, end_iso = start_date.isoformat(), end_date.isoformat()
+    symbols = [symbol.upper() for symbol in symbols]
+    
+    with _history_lock:
+        cached = {}
+        for symbol in symbols:
+            key = (symbol, start_iso, end_iso)
+            if key in _history_cache:
+                _history_cache.move_to_end(key)
+                cached[symbol] = _history_cache[key]
+    
+    missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in cached]
+    if missing:
+        frame = yf.download(missing, start=start_date, end=end_date, group_by='ticker',
+                            auto_adjust=True, threads=True, progress=False, session=session)
+        multi = frame is not None and frame.columns.nlevels > 1
+        with _history_lock:
+            for symbol in missing:
+                if frame is None or frame.empty:
+                    history = _EMPTY_HISTORY
+                elif multi:
+                    if symbol not in frame.columns.get_level_values(0):
+                        history = _EMPTY_HISTORY
+                    else:
+                        history = _history_arrays(frame[symbol])
+                else:
+                    history = _history_arrays(frame)
+                cached[symbol] = history
+                if history[1].size:
+                    _history_cache[(symbol, start_iso, end_iso)] = history
+            while len(_history_cache) > _HISTORY_CACHE_SIZE:
+                _history_cache.popitem(last=False)
+    
+    return end_date, [cached[symbol] for symbol in symbols]
+
+
+def _daily_returns(dates: np.ndarray, closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Daily close-to-close returns with their dates, NaN days dropped
+    
+    Returns:
+        (datetime64[ns] dates, float returns) arrays of equal length
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = closes[1:] / closes[:-1] - 1.0
+    keep = ~np.isnan(returns)
+    return dates[1:][keep], returns[keep]
+
+
+def _fused_return_stats(returns, spy_returns):
+    """
+    One pass over aligned daily returns accumulating every backtest statistic
+    
+    Mean/variance/covariance use Welford updates (numerically stable in a
+    single pass). Inputs are float32; every accumulator is float64.
+    The drawdown follows np.minimum semantics: a NaN drawdown step
+    poisons the result.
+    
+    Returns:
+        (mean, M2, spy mean, spy M2, co-moment, min drawdown, positive days,
+         gains, negative sum, negative days, negative M2)
+    """
+    mean = spy_mean = 0.0
+    m2 = spy_m2 = co_moment = 0.0
+    cumulative = 1.0
+    peak = -np.inf
+    drawdown = np.inf
+    positive_days = 0
+    gains = negative_sum = 0.0
+    negative_days = 0
+    negative_mean = negative_m2 = 0.0
+    for i in range(returns.shape[0]):
+        x = returns[i]
+        y = spy_returns[i]
+        k = i + 1
+        dx = x - mean
+        mean += dx / k
+        m2 += dx * (x - mean)
+        dy = y - spy_mean
+        spy_mean += dy / k
+        spy_m2 += dy * (y - spy_mean)
+        co_moment += dx * (y - spy_mean)
+        
+        cumulative *= 1.0 + x
+        if cumulative > peak:
+            peak = cumulative
+        step = (cumulative - peak) / peak
+        if not np.isnan(drawdown) and (step < drawdown or np.isnan(step)):
+            drawdown = step
+        
+        if x > 0:
+            positive_days += 1
+            gains += x
+        elif x < 0:
+            negative_sum += x
+            negative_days += 1
+            dz = x - negative_mean
+            negative_mean += dz / negative_days
+            negative_m2 += dz * (x - negative_mean)
+    return (mean, m2, spy_mean, spy_m2, co_moment, drawdown, positive_days,
+            gains, negative_sum, negative_days, negative_m2)
+
+
+# Compile the fused statistics kernel when Numba is installed and warm it up.
+# Without Numba it is never called: _return_stats falls back to NumPy
+_numba_available = False
+try:
+    from numba import njit
+    _fused_return_stats = njit(cache=True, error_model='numpy')(_fused_return_stats)
+    _fused_return_stats(np.zeros(2, dtype=np.float32), np.zeros(2, dtype=np.float32))
+    _numba_available = True
+except ImportError:
+    pass
+
+
+def _return_stats(returns: np.ndarray, spy_returns: np.ndarray) -> Tuple:
+    """
+    Sample statistics of aligned daily returns, NaN below two observations
+    like pandas
+    
+    Returns:
+        (std, spy mean, spy variance, covariance, max drawdown fraction,
+         positive days, gains, losses, downside std)
+    """
+    n = returns.size
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if _numba_available:
+            (_, m2, spy_mean, spy_m2, co_moment, drawdown, positive_days,
+             gains, negative_sum, negative_days, negative_m2) = _fused_return_stats(returns, spy_returns)
+            std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+            spy_variance = spy_m2 / (n - 1) if n > 1 else np.nan
+            # Non-finite returns leave the co-moment +/-inf where NumPy gives NaN
+            covariance = co_moment / (n - 1) if n > 1 and not np.isnan(std) else np.nan
+            spy_mean = spy_mean if n else np.nan
+            drawdown = drawdown if n else np.nan
+            losses = abs(negative_sum)
+            downside_std = np.sqrt(negative_m2 / (negative_days - 1)) if negative_days > 1 else 0
+            return (std, spy_mean, spy_variance, covariance, drawdown,
+                    positive_days, gains, losses, downside_std)
+        
+        # float32 returns; accumulate the statistics in float64
+        returns = returns.astype(np.float64)
+        spy_returns = spy_returns.astype(np.float64)
+        mean = returns.mean() if n else np.nan
+        spy_mean = spy_returns.mean() if n else np.nan
+        centered = returns - mean
+        spy_centered = spy_returns - spy_mean
+        std = np.sqrt(np.dot(centered, centered) / (n - 1)) if n > 1 else np.nan
+        spy_variance = np.dot(spy_centered, spy_centered) / (n - 1) if n > 1 else np.nan
+        covariance = np.dot(centered, spy_centered) / (n - 1) if n > 1 else np.nan
+        
+        if n:
+            cumulative = np.cumprod(1 + returns)
+            running_max = np.maximum.accumulate(cumulative)
+            drawdown = ((cumulative - running_max) / running_max).min()
+        else:
+            drawdown = np.nan
+        
+        up = returns > 0
+        down = returns < 0
+        positive_days = np.count_nonzero(up)
+        gains = returns[up].sum()
+        losses = abs(returns[down].sum())
+        downside_returns = returns[down]
+        downside_std = downside_returns.std(ddof=1) if downside_returns.size > 1 else 0
+        return (std, spy_mean, spy_variance, covariance, drawdown,
+                positive_days, gains, losses, downside_std)
+
 
 class EnhancedBacktester:
     """Advanced backtesting with multi-year tracking and benchmark comparison"""
     
+    _PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+    )
+    _READ_POOL_SIZE = 4
+    
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
+        # One long-lived writer plus lazily opened readers; connection setup
+        # (open, WAL header read, journal setup) dominated the save path
+        self._conn = self._open_connection()
+        self._write_lock = threading.Lock()
+        self._read_pool: queue.Queue = queue.Queue(maxsize=self._READ_POOL_SIZE)
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._session = self._open_session()
+        self._ensure_schema()
+        self.prune_backtest_results()
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection with the backtester's PRAGMAs applied"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        for pragma in self._PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @staticmethod
+    def _open_session():
+        """HTTP session shared by every yfinance request this backtester makes
+        
+        Keeps TLS connections to Yahoo alive between downloads. curl_cffi is
+        preferred (it is what yfinance uses itself); plain requests is the
+        fallback.
+        """
+        if _curl_available:
+            return curl_requests.Session(impersonate="chrome")
+        
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+        session.headers["User-Agent"] = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                                         "AppleWebKit/537.36 (KHTML, like Gecko) "
+                                         "Chrome/120.0 Safari/537.36")
+        return session
     
     def get_connection(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        """Borrow a read connection from the pool (opened on first use)
+        
+        Hand it back with release_connection() instead of closing it.
+        """
+        try:
+            return self._read_pool.get_nowait()
+        except queue.Empty:
+            return self._open_connection()
+    
+    def release_connection(self, conn: sqlite3.Connection):
+        """Return a read connection to the pool, closing it if the pool is full"""
+        try:
+            self._read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
     
     def backtest_ticker_history(self, ticker: str, years: int = 3) -> Optional[Dict]:
         """
@@ -34,71 +379,61 @@ class EnhancedBacktester:
         - Benchmark comparison (SPY)
         """
         try:
-            # Fetch historical data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=years*365)
-            
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
+            # Fetch historical data (ticker and SPY benchmark in one download)
+            _, (hist, spy_hist) = _fetch_histories([ticker, 'SPY'], years*365, self._session)
+            dates, close = hist
+            spy_dates, spy_close = spy_hist
             
-            if hist.empty or len(hist) < 50:
+            if close.size < 50:
                 return None
             
-            # Fetch SPY benchmark
-            spy = yf.Ticker('SPY')
-            spy_hist = spy.history(start=start_date, end=end_date)
-            
-            # Calculate returns
-            returns = hist['Close'].pct_change().dropna()
-            spy_returns = spy_hist['Close'].pct_change().dropna()
+            # Calculate returns on raw arrays (pandas per-op overhead dominates
+            # at a few hundred rows)
+            dates, returns = _daily_returns(dates, close)
+            spy_dates, spy_returns = _daily_returns(spy_dates, spy_close)
             
             # Align dates
-            common_dates = returns.index.intersection(spy_returns.index)
-            returns = returns[common_dates]
-            spy_returns = spy_returns[common_dates]
+            _, idx, spy_idx = np.intersect1d(dates, spy_dates, assume_unique=True,
+                                             return_indices=True)
+            returns = returns[idx]
+            spy_returns = spy_returns[spy_idx]
+            n = returns.size
             
             # Performance metrics
-            total_return = ((hist['Close'].iloc[-1] / hist['Close'].iloc[0]) - 1) * 100
-            spy_total_return = ((spy_hist['Close'].iloc[-1] / spy_hist['Close'].iloc[0]) - 1) * 100
+            total_return = ((float(close[-1]) / float(close[0])) - 1) * 100
+            spy_total_return = ((float(spy_close[-1]) / float(spy_close[0])) - 1) * 100
             
             # Annualized return
-            days = len(hist)
+            days = close.size
             years_actual = days / 252  # Trading days
             annualized_return = ((1 + total_return/100) ** (1/years_actual) - 1) * 100 if years_actual > 0 else 0
             
+            (std, spy_mean, spy_variance, covariance, drawdown,
+             positive_days, gains, losses, downside_std) = _return_stats(returns, spy_returns)
+            
             # Volatility (annualized)
-            volatility = returns.std() * (252 ** 0.5) * 100
+            volatility = std * (252 ** 0.5) * 100
             
             # Sharpe Ratio (assuming 4% risk-free rate)
             risk_free_rate = 0.04
             sharpe_ratio = (annualized_return/100 - risk_free_rate) / (volatility/100) if volatility > 0 else 0
             
             # Max Drawdown
-            cumulative = (1 + returns).cumprod()
-            running_max = cumulative.expanding().max()
-            drawdown = (cumulative - running_max) / running_max
-            max_drawdown = drawdown.min() * 100
+            max_drawdown = drawdown * 100
             
             # Win Rate
-            positive_days = (returns > 0).sum()
-            total_days = len(returns)
-            win_rate = (positive_days / total_days * 100) if total_days > 0 else 0
+            win_rate = (positive_days / n * 100) if n > 0 else 0
             
             # Profit Factor
-            gains = returns[returns > 0].sum()
-            losses = abs(returns[returns < 0].sum())
             profit_factor = (gains / losses) if losses > 0 else 0
             
             # Alpha & Beta vs SPY
-            covariance = returns.cov(spy_returns)
-            spy_variance = spy_returns.var()
             beta = covariance / spy_variance if spy_variance > 0 else 1
             
-            alpha = annualized_return - (risk_free_rate * 100 + beta * (spy_returns.mean() * 252 * 100 - risk_free_rate * 100))
+            alpha = annualized_return - (risk_free_rate * 100 + beta * (spy_mean * 252 * 100 - risk_free_rate * 100))
             
             # Sortino Ratio (downside deviation)
-            downside_returns = returns[returns < 0]
-            downside_std = downside_returns.std() * (252 ** 0.5) if len(downside_returns) > 0 else 0
+            downside_std = downside_std * (252 ** 0.5)
             sortino_ratio = (annualized_return/100 - risk_free_rate) / (downside_std) if downside_std > 0 else 0
             
             # Calmar Ratio
@@ -107,26 +442,31 @@ class EnhancedBacktester:
             return {
                 'ticker': ticker,
                 'period_years': years,
-                'total_return': round(total_return, 2),
-                'annualized_return': round(annualized_return, 2),
-                'volatility': round(volatility, 2),
-                'sharpe_ratio': round(sharpe_ratio, 2),
-                'sortino_ratio': round(sortino_ratio, 2),
-                'calmar_ratio': round(calmar_ratio, 2),
-                'max_drawdown': round(max_drawdown, 2),
-                'win_rate': round(win_rate, 1),
-                'profit_factor': round(profit_factor, 2),
-                'alpha': round(alpha, 2),
-                'beta': round(beta, 2),
-                'spy_return': round(spy_total_return, 2),
-                'excess_return': round(total_return - spy_total_return, 2),
-                'trading_days': len(hist)
+                'total_return': round(float(total_return), 2),
+                'annualized_return': round(float(annualized_return), 2),
+                'volatility': round(float(volatility), 2),
+                'sharpe_ratio': round(float(sharpe_ratio), 2),
+                'sortino_ratio': round(float(sortino_ratio), 2),
+                'calmar_ratio': round(float(calmar_ratio), 2),
+                'max_drawdown': round(float(max_drawdown), 2),
+                'win_rate': round(float(win_rate), 1),
+                'profit_factor': round(float(profit_factor), 2),
+                'alpha': round(float(alpha), 2),
+                'beta': round(float(beta), 2),
+                'spy_return': round(float(spy_total_return), 2),
+                'excess_return': round(float(total_return - spy_total_return), 2),
+                'trading_days': close.size
             }
             
         except Exception as e:
             print(f"Backtest error for {ticker}: {e}")
             return None
     
+    async def backtest_ticker_history_async(self, ticker: str, years: int = 3) -> Optional[Dict]:
+        """backtest_ticker_history run on the backtest worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BACKTEST_EXECUTOR, self.backtest_ticker_history, ticker, years)
+    
     def get_multi_timeframe_performance(self, ticker: str) -> Dict:
         """Get performance across multiple timeframes"""
         timeframes = {
@@ -138,68 +478,80 @@ class EnhancedBacktester:
             '3Y': 1095
         }
         
-        results = {}
+        results = dict.fromkeys(timeframes)
+        
+        # Every window is a suffix of the longest one: fetch it once and
+        # locate each window's first session with a binary search
+        try:
+            end_date, ((dates, closes),) = _fetch_histories([ticker], max(timeframes.values()),
+                                                           self._session)
+            last = closes.size - 1
+        except Exception:
+            return results
         
         for period, days in timeframes.items():
-            try:
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=days)
-                
-                stock = yf.Ticker(ticker)
-                hist = stock.history(start=start_date, end=end_date)
-                
-                if not hist.empty and len(hist) >= 2:
-                    total_return = ((hist['Close'].iloc[-1] / hist['Close'].iloc[0]) - 1) * 100
-                    results[period] = round(total_return, 2)
-                else:
-                    results[period] = None
-                    
-            except Exception:
-                results[period] = None
+            cutoff = np.datetime64(end_date - timedelta(days=days), 'ns')
+            idx = np.searchsorted(dates, cutoff)
+            if idx < last:
+                total_return = ((float(closes[-1]) / float(closes[idx])) - 1) * 100
+                results[period] = round(total_return, 2)
         
         return results
     
+    def _ensure_schema(self):
+        """Create the backtest_results table once, on the shared writer"""
+        with self._write_lock:
+            row = self._conn.execute(_TABLE_DEF_SQL).fetchone()
+            if row and 'period_years, backtest_date)' not in row[0]:
+                for statement in _MIGRATE_SQL:
+                    self._conn.execute(statement)
+            self._conn.execute(_CREATE_TABLE_SQL)
+            self._conn.commit()
+    
+    def prune_backtest_results(self, days: int = _BACKTEST_RETENTION_DAYS) -> int:
+        """Delete stored backtests older than `days`
+        
+        Returns:
+            Number of rows removed
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._write_lock:
+            removed = self._conn.execute(_PRUNE_SQL, (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+    
+    @staticmethod
+    def _result_row(ticker: str, backtest_data: Dict) -> Tuple:
+        """Flatten a backtest result dict into _INSERT_SQL parameter order"""
+        # Hourly bucket: re-running a ticker and period within the hour replaces its row
+        backtest_date = datetime.now().replace(minute=0, second=0, microsecond=0).isoformat()
+        return (ticker, backtest_date, backtest_data['period_years'],
+                backtest_data['total_return'], backtest_data['annualized_return'],
+                backtest_data['volatility'], backtest_data['sharpe_ratio'],
+                backtest_data['sortino_ratio'], backtest_data['calmar_ratio'],
+                backtest_data['max_drawdown'], backtest_data['win_rate'],
+                backtest_data['profit_factor'], backtest_data['alpha'],
+                backtest_data['beta'], backtest_data['spy_return'],
+                backtest_data['excess_return'])
+    
     def save_backtest_results(self, ticker: str, backtest_data: Dict):
         """Save backtest results to database"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS backtest_results
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      ticker TEXT,
-                      backtest_date TEXT,
-                      period_years INTEGER,
-                      total_return REAL,
-                      annualized_return REAL,
-                      volatility REAL,
-                      sharpe_ratio REAL,
-                      sortino_ratio REAL,
-                      calmar_ratio REAL,
-                      max_drawdown REAL,
-                      win_rate REAL,
-                      profit_factor REAL,
-                      alpha REAL,
-                      beta REAL,
-                      spy_return REAL,
-                      excess_return REAL,
-                      UNIQUE(ticker, backtest_date))''')
-        
-        c.execute('''INSERT OR REPLACE INTO backtest_results
-                     (ticker, backtest_date, period_years, total_return, annualized_return,
-                      volatility, sharpe_ratio, sortino_ratio, calmar_ratio, max_drawdown,
-                      win_rate, profit_factor, alpha, beta, spy_return, excess_return)
-                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                  (ticker, datetime.now().isoformat(), backtest_data['period_years'],
-                   backtest_data['total_return'], backtest_data['annualized_return'],
-                   backtest_data['volatility'], backtest_data['sharpe_ratio'],
-                   backtest_data['sortino_ratio'], backtest_data['calmar_ratio'],
-                   backtest_data['max_drawdown'], backtest_data['win_rate'],
-                   backtest_data['profit_factor'], backtest_data['alpha'],
-                   backtest_data['beta'], backtest_data['spy_return'],
-                   backtest_data['excess_return']))
+        with self._write_lock:
+            self._conn.execute(_INSERT_SQL, self._result_row(ticker, backtest_data))
+            self._conn.commit()
+    
+    def save_many(self, rows: List[Tuple[str, Dict]]):
+        """Save several backtest results in a single transaction
         
-        conn.commit()
-        conn.close()
+        Args:
+            rows: (ticker, backtest_data) pairs as passed to save_backtest_results
+        """
+        params = [self._result_row(ticker, data) for ticker, data in rows]
+        if not params:
+            return
+        with self._write_lock:
+            self._conn.executemany(_INSERT_SQL, params)
+            self._conn.commit()
     
     def get_sector_comparison(self, ticker: str, sector: str) -> Optional[Dict]:
         """Compare ticker performance to sector ETF"""
@@ -222,20 +574,14 @@ class EnhancedBacktester:
             return None
         
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=365)
+            _, ((_, stock_close), (_, etf_close)) = _fetch_histories([ticker, sector_etf], 365,
+                                                                        self._session)
             
-            stock = yf.Ticker(ticker)
-            etf = yf.Ticker(sector_etf)
-            
-            stock_hist = stock.history(start=start_date, end=end_date)
-            etf_hist = etf.history(start=start_date, end=end_date)
-            
-            if stock_hist.empty or etf_hist.empty:
+            if not stock_close.size or not etf_close.size:
                 return None
             
-            stock_return = ((stock_hist['Close'].iloc[-1] / stock_hist['Close'].iloc[0]) - 1) * 100
-            etf_return = ((etf_hist['Close'].iloc[-1] / etf_hist['Close'].iloc[0]) - 1) * 100
+            stock_return = ((float(stock_close[-1]) / float(stock_close[0])) - 1) * 100
+            etf_return = ((float(etf_close[-1]) / float(etf_close[0])) - 1) * 100
             
             return {
                 'sector': sector,
@@ -249,10 +595,70 @@ class EnhancedBacktester:
         except Exception:
             return None
     
+    def _load_latest_backtest(self, ticker: str, years: int) -> Optional[Tuple[Dict, datetime]]:
+        """Most recent stored backtest for a ticker, with the time it was run"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute(_LATEST_RESULT_SQL, (ticker, years)).fetchone()
+        finally:
+            conn.rollback()
+            self.release_connection(conn)
+        
+        if not row:
+            return None
+        
+        backtest = dict(zip(_RESULT_COLUMNS, row[1:]))
+        backtest['ticker'] = ticker
+        return backtest, datetime.fromisoformat(row[0])
+    
+    def _refresh_backtest(self, ticker: str, years: int) -> Optional[Dict]:
+        """Recompute a backtest and store it"""
+        backtest = self.backtest_ticker_history(ticker, years=years)
+        if backtest:
+            self.save_backtest_results(ticker, backtest)
+        return backtest
+    
+    def _refresh_in_background(self, ticker: str, years: int):
+        """Recompute a stale backtest on the backtest pool (one per ticker at a time)"""
+        key = (ticker, years)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def run():
+            try:
+                self._refresh_backtest(ticker, years)
+            except Exception as e:
+                print(f"Backtest refresh error for {ticker}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        _BACKTEST_EXECUTOR.submit(run)
+    
+    def get_cached_backtest(self, ticker: str, years: int = 3) -> Optional[Dict]:
+        """
+        Backtest results served from backtest_results when possible
+        
+        A stored run younger than _BACKTEST_FRESH_HOURS is returned as-is. An
+        older one is returned immediately while a fresh backtest runs in the
+        background (stale-while-revalidate). With nothing stored, the
+        backtest is computed and saved before returning.
+        """
+        stored = self._load_latest_backtest(ticker, years)
+        if stored is None:
+            return self._refresh_backtest(ticker, years)
+        
+        backtest, backtest_date = stored
+        if datetime.now() - backtest_date >= timedelta(hours=_BACKTEST_FRESH_HOURS):
+            self._refresh_in_background(ticker, years)
+        return backtest
+    
     def get_risk_adjusted_metrics(self, ticker: str) -> Optional[Dict]:
         """Calculate advanced risk-adjusted performance metrics"""
         try:
-            backtest = self.backtest_ticker_history(ticker, years=3)
+            backtest = self.get_cached_backtest(ticker, years=3)
             if not backtest:
                 return None
             
@@ -289,3 +695,8 @@ class EnhancedBacktester:
             
         except Exception:
             return None
+    
+    async def get_risk_adjusted_metrics_async(self, ticker: str) -> Optional[Dict]:
+        """get_risk_adjusted_metrics run on the backtest worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BACKTEST_EXECUTOR, self.get_risk_adjusted_metrics, ticker)
@@ -1,53 +1,66 @@
 """
 Button Handlers for Discord Dashboard
 Handles all button click interactions
-EXTREME LOGGING ENABLED - Every action is logged
+Per-press tracing is logged at DEBUG; failures are logged with tracebacks
 """
 
+import asyncio
 import discord
+import logging
+import os
+import time
 from discord import ui
-from typing import Optional, TYPE_CHECKING
-from datetime import datetime
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TYPE_CHECKING
 
 from database import DatabaseManager
 from channel_manager import ChannelManager
 from modal_handlers import ModalHandlers
 
-# EXTREME LOGGING SETTINGS
-LOG_BUTTON_PRESSES = True
-LOG_STATE_CHANGES = True
-LOG_ERRORS = True
-LOG_ALL_FUNCTIONS = True
+# Dashboard views and the report generator are optional; without them the
+# message keeps its current components and report requests are declined
+try:
+    from discord_dashboard import OverviewView, SettingsView, TickerView
+except ImportError:
+    OverviewView = SettingsView = TickerView = None
+
+try:
+    from ticker_report import TickerReportGenerator
+except ImportError:
+    TickerReportGenerator = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds a generated dashboard embed is shared between button presses
+EMBED_CACHE_TTL = 10.0
+
+
+def _emit_header(name, interaction):
+    """Log which button was pressed, by whom and where"""
+    try:
+        button_label = (interaction.data or {}).get('custom_id', 'unknown')
+    except AttributeError:
+        button_label = 'unknown'
+    try:
+        user = interaction.user
+    except AttributeError:
+        user = 'unknown'
+    try:
+        guild = interaction.guild.name
+    except AttributeError:
+        guild = 'DM'
+    logger.debug("%s button=%s user=%s guild=%s", name, button_label, user, guild)
 
 
 def log_button_press(func):
     """Decorator to log all button press calls"""
-    async def wrapper(*args, **kwargs):
-        interaction = args[1] if len(args) > 1 else kwargs.get('interaction')
-        button_label = getattr(interaction, 'custom_id', 'unknown') or getattr(interaction, 'data', {}).get('custom_id', 'unknown')
-        user = interaction.user if hasattr(interaction, 'user') else 'unknown'
-        guild = interaction.guild.name if hasattr(interaction, 'guild') and interaction.guild else 'DM'
-        
-        print(f"\n{'='*70}")
-        print(f"[BUTTON PRESS] {func.__name__}")
-        print(f"  Button/Action: {button_label}")
-        print(f"  User: {user} (ID: {getattr(user, 'id', 'unknown')})")
-        print(f"  Guild: {guild}")
-        print(f"  Channel: {getattr(interaction, 'channel', 'unknown')}")
-        print(f"  Time: {datetime.now().isoformat()}")
-        print(f"{'='*70}\n")
-        
+    async def wrapper(self, interaction, *args, **kwargs):
+        if logger.isEnabledFor(logging.DEBUG):
+            _emit_header(func.__name__, interaction)
         try:
-            result = await func(*args, **kwargs)
-            print(f"[SUCCESS] {func.__name__} completed")
-            return result
-        except Exception as e:
-            print(f"\n{'='*70}")
-            print(f"[ERROR] {func.__name__} FAILED!")
-            print(f"  Error: {e}")
-            print(f"  Traceback:\n{traceback.format_exc()}")
-            print(f"{'='*70}\n")
+            return await func(self, interaction, *args, **kwargs)
+        except Exception:
+            logger.exception("%s failed", func.__name__)
             raise
     return wrapper
 
@@ -56,19 +69,31 @@ def log_state_change(state_description):
     """Decorator to log state changes"""
     def decorator(func):
         async def wrapper(*args, **kwargs):
-            interaction = args[1] if len(args) > 1 else kwargs.get('interaction')
-            print(f"\n{'='*70}")
-            print(f"[STATE CHANGE] {state_description}")
-            print(f"  Old state: Getting current state...")
-            print(f"  New state: {state_description}")
-            print(f"  User: {interaction.user if hasattr(interaction, 'user') else 'unknown'}")
-            print(f"  Time: {datetime.now().isoformat()}")
-            print(f"{'='*70}\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                interaction = args[1] if len(args) > 1 else kwargs.get('interaction')
+                logger.debug("state=%s user=%s", state_description,
+                             getattr(interaction, 'user', 'unknown'))
             return await func(*args, **kwargs)
         return wrapper
     return decorator
 
 
+def _fetch_movers(db: DatabaseManager, direction: str):
+    """Read the top 10 tracked tickers by change, run off the event loop"""
+    order = 'DESC' if direction == 'gainers' else 'ASC'
+    with db.read_connection() as conn:
+        return conn.execute('SELECT ticker, price_change_pct, current_price FROM stock_tracking '
+                            'WHERE status = ? ORDER BY price_change_pct ' + order + ' LIMIT 10',
+                            ('tracking',)).fetchall()
+
+
+def _fetch_recent_alerts(db: DatabaseManager, limit: int = 10):
+    """Read the newest alert_log rows, run off the event loop"""
+    with db.read_connection() as conn:
+        return conn.execute('SELECT ticker, alert_type, confidence, alert_date FROM alert_log '
+                            'ORDER BY alert_date DESC LIMIT ?', (limit,)).fetchall()
+
+
 class ButtonHandlers:
     """Handles all button click interactions"""
     
@@ -80,361 +105,372 @@ class ButtonHandlers:
         self.channel_manager = channel_manager
         self.modal_handlers = modal_handlers
         
-        print(f"\n{'='*70}")
-        print(f"[INIT] ButtonHandlers initialized")
-        print(f"  Bot: {bot}")
-        print(f"  DB: {db}")
-        print(f"  Channel Manager: {channel_manager}")
-        print(f"  Modal Handlers: {modal_handlers}")
-        print(f"{'='*70}\n")
+        # Static embeds are only serialized on send, so one instance each is shared
+        self._fallback_overview = discord.Embed(title="Market Overview", color=0x00ff00)
+        self._fallback_settings = discord.Embed(title="Settings", color=0xffaa00)
+        self._fallback_ticker = discord.Embed(title="Ticker", color=0x00aaff)
+        self._autorefresh_on = discord.Embed(title="Auto-Refresh enabled", color=0x00ff00)
+        self._autorefresh_off = discord.Embed(title="Auto-Refresh disabled", color=0xffaa00)
+        self._removed = discord.Embed(title="Removed", color=0x00ff00)
+        self._not_found = discord.Embed(title="Not Found", color=0xffaa00)
+        
+        # One shared generator; its single worker keeps page_count tied to the
+        # report just rendered and keeps rendering off the event loop
+        self.report_generator = TickerReportGenerator(db) if TickerReportGenerator else None
+        self._report_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report')
+        
+        # (view, ticker) -> (expires_at, task); concurrent presses await the same task
+        self._embed_cache: Dict[Tuple[str, Optional[str]], Tuple[float, asyncio.Task]] = {}
+        
+        logger.debug("ButtonHandlers initialized")
+    
+    
+    async def _cached_embed(self, view: str, ticker: Optional[str],
+                            generate: Callable[[], Awaitable[discord.Embed]]) -> discord.Embed:
+        """Return a recently generated embed for (view, ticker), generating it at most once per TTL
+        
+        Args:
+            view: Dashboard view name ('overview', 'ticker' or 'settings')
+            ticker: Ticker symbol for ticker views, else None
+            generate: Zero-argument coroutine factory that builds the embed
+        
+        Returns:
+            The shared embed; callers must not mutate it
+        """
+        key = (view, ticker.upper() if ticker else None)
+        now = time.monotonic()
+        entry = self._embed_cache.get(key)
+        # A generation still in flight is joined even past its TTL (single-flight)
+        if entry is None or (entry[0] <= now and entry[1].done()):
+            # Each ticker viewed adds a key, so sweep finished, expired ones here
+            for stale in [k for k, (expires_at, t) in self._embed_cache.items()
+                          if expires_at <= now and t.done()]:
+                del self._embed_cache[stale]
+            task = asyncio.ensure_future(generate())
+            entry = (now + EMBED_CACHE_TTL, task)
+            self._embed_cache[key] = entry
+        try:
+            return await asyncio.shield(entry[1])
+        except Exception:
+            # Don't serve a failed generation to later presses
+            if self._embed_cache.get(key) is entry:
+                del self._embed_cache[key]
+            raise
+    
+    def invalidate_embeds(self, view: Optional[str] = None):
+        """Drop cached embeds, all of them or just those for one view"""
+        if view is None:
+            self._embed_cache.clear()
+        else:
+            for key in [k for k in self._embed_cache if k[0] == view]:
+                del self._embed_cache[key]
     
     @log_button_press
     async def handle_back_to_overview(self, interaction: discord.Interaction):
         """Return to overview view"""
-        print(f"[FUNCTION] handle_back_to_overview called")
-        print(f"  Interaction: {interaction}")
-        print(f"  User: {interaction.user}")
-        print(f"  Channel: {interaction.channel}")
+        logger.debug("Channel: %s", interaction.channel)
         
         channel_id = str(interaction.channel_id)
-        old_state = self.channel_manager.get_channel_state(channel_id)
-        print(f"  Old state: {old_state}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Old state: %s", self.channel_manager.get_channel_state(channel_id))
         
-        self.channel_manager.update_channel_state(
-            channel_id, current_view='overview', current_ticker=None
+        self.channel_manager.record_interaction(
+            channel_id, str(interaction.user.id), current_view='overview', current_ticker=None
         )
-        print(f"  State updated to: overview")
-        
-        self.channel_manager.update_user_activity(str(interaction.user.id))
-        print(f"  User activity updated")
+        logger.debug("State updated to: overview")
         
         bot = interaction.client
-        print(f"  Bot from interaction: {bot}")
+        logger.debug("Bot from interaction: %s", bot)
         
         if hasattr(bot, 'get_overview_embed'):
-            print(f"  Calling bot.get_overview_embed()")
-            embed = await bot.get_overview_embed()
+            embed = await self._cached_embed('overview', None, bot.get_overview_embed)
         else:
-            print(f"  Bot doesn't have get_overview_embed - using fallback")
-            embed = discord.Embed(title="Market Overview", color=0x00ff00)
+            logger.debug("Bot doesn't have get_overview_embed - using fallback")
+            embed = self._fallback_overview
         
-        from discord_dashboard import OverviewView
-        print(f"  Creating OverviewView")
-        view = OverviewView(bot)
+        view = OverviewView(bot) if OverviewView else discord.utils.MISSING
         
-        print(f"  Sending response: edit message with embed and view")
+        logger.debug("Sending response: edit message with embed and view")
         await interaction.response.edit_message(embed=embed, view=view)
-        print(f"  Response sent successfully")
+        logger.debug("Response sent successfully")
     
     @log_button_press
     async def handle_settings(self, interaction: discord.Interaction):
         """Open settings view"""
-        print(f"[FUNCTION] handle_settings called")
-        print(f"  Interaction: {interaction}")
-        print(f"  User: {interaction.user}")
         
         channel_id = str(interaction.channel_id)
-        old_state = self.channel_manager.get_channel_state(channel_id)
-        print(f"  Old state: {old_state}")
-        
-        self.channel_manager.update_channel_state(channel_id, current_view='settings')
-        print(f"  State updated to: settings")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Old state: %s", self.channel_manager.get_channel_state(channel_id))
         
-        self.channel_manager.update_user_activity(str(interaction.user.id))
-        print(f"  User activity updated")
+        self.channel_manager.record_interaction(
+            channel_id, str(interaction.user.id), current_view='settings'
+        )
+        logger.debug("State updated to: settings")
         
         bot = interaction.client
         if hasattr(bot, 'get_settings_embed'):
-            print(f"  Calling bot.get_settings_embed()")
-            embed = await bot.get_settings_embed()
+            embed = await self._cached_embed('settings', None, bot.get_settings_embed)
         else:
-            print(f"  Bot doesn't have get_settings_embed - using fallback")
-            embed = discord.Embed(title="Settings", color=0xffaa00)
+            logger.debug("Bot doesn't have get_settings_embed - using fallback")
+            embed = self._fallback_settings
         
-        from discord_dashboard import SettingsView
-        print(f"  Creating SettingsView")
-        view = SettingsView(bot)
+        view = SettingsView(bot) if SettingsView else discord.utils.MISSING
         
-        print(f"  Sending response: edit message")
+        logger.debug("Sending response: edit message")
         await interaction.response.edit_message(embed=embed, view=view)
-        print(f"  Response sent successfully")
+        logger.debug("Response sent successfully")
     
     @log_button_press
     async def handle_refresh(self, interaction: discord.Interaction):
         """Force refresh dashboard data"""
-        print(f"[FUNCTION] handle_refresh called")
-        print(f"  Interaction: {interaction}")
-        print(f"  User: {interaction.user}")
-        print(f"  Channel: {interaction.channel}")
+        logger.debug("Channel: %s", interaction.channel)
         
         self.channel_manager.update_user_activity(str(interaction.user.id))
-        print(f"  User activity updated")
+        logger.debug("User activity updated")
         
-        print(f"  Deferring response (ephemeral)")
+        logger.debug("Deferring response (ephemeral)")
         await interaction.response.defer(ephemeral=True)
         
         try:
             channel_id = str(interaction.channel_id)
             state = self.channel_manager.get_channel_state(channel_id)
-            print(f"  Current state: {state}")
+            logger.debug("Current state: %s", state)
             
             bot = interaction.client
-            print(f"  Bot: {bot}")
+            logger.debug("Bot: %s", bot)
             
             current_view = state.get('current_view', 'overview')
-            print(f"  Current view: {current_view}")
+            logger.debug("Current view: %s", current_view)
             
             if current_view == 'overview' and hasattr(bot, 'get_overview_embed'):
-                print(f"  Refreshing overview embed")
-                embed = await bot.get_overview_embed()
+                logger.debug("Refreshing overview embed")
+                embed = await self._cached_embed('overview', None, bot.get_overview_embed)
             elif current_view == 'ticker' and hasattr(bot, 'get_ticker_embed'):
                 ticker = state.get('current_ticker')
-                print(f"  Refreshing ticker embed for: {ticker}")
-                embed = await bot.get_ticker_embed(ticker) if ticker else discord.Embed(title="Ticker", color=0x00aaff)
+                logger.debug("Refreshing ticker embed for: %s", ticker)
+                if ticker:
+                    embed = await self._cached_embed('ticker', ticker, lambda: bot.get_ticker_embed(ticker))
+                else:
+                    embed = self._fallback_ticker
             elif hasattr(bot, 'get_settings_embed'):
-                print(f"  Refreshing settings embed")
-                embed = await bot.get_settings_embed()
+                logger.debug("Refreshing settings embed")
+                embed = await self._cached_embed('settings', None, bot.get_settings_embed)
             else:
-                print(f"  Using fallback overview embed")
-                embed = discord.Embed(title="Market Overview", color=0x00ff00)
+                logger.debug("Using fallback overview embed")
+                embed = self._fallback_overview
             
-            print(f"  Sending followup: Dashboard refreshed!")
+            logger.debug("Sending followup: Dashboard refreshed!")
             await interaction.followup.send("Dashboard refreshed!", ephemeral=True)
-            print(f"  Refresh completed successfully")
-        except Exception as e:
-            print(f"\n{'='*70}")
-            print(f"[ERROR] Failed to refresh dashboard!")
-            print(f"  Error: {e}")
-            print(f"  Traceback:\n{traceback.format_exc()}")
-            print(f"{'='*70}\n")
+            logger.debug("Refresh completed successfully")
+        except Exception:
+            logger.exception("Failed to refresh dashboard")
             await interaction.followup.send("Error refreshing dashboard", ephemeral=True)
     
     @log_button_press
     async def handle_view_ticker(self, interaction: discord.Interaction, ticker: str):
         """View detailed ticker information"""
-        print(f"[FUNCTION] handle_view_ticker called")
-        print(f"  Ticker: {ticker}")
-        print(f"  User: {interaction.user}")
-        print(f"  Channel: {interaction.channel}")
+        logger.debug("Ticker: %s", ticker)
+        logger.debug("Channel: %s", interaction.channel)
         
         channel_id = str(interaction.channel_id)
-        old_state = self.channel_manager.get_channel_state(channel_id)
-        print(f"  Old state: {old_state}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Old state: %s", self.channel_manager.get_channel_state(channel_id))
         
-        self.channel_manager.update_channel_state(
-            channel_id, current_view='ticker', current_ticker=ticker.upper()
+        self.channel_manager.record_interaction(
+            channel_id, str(interaction.user.id), current_view='ticker', current_ticker=ticker.upper()
         )
-        print(f"  State updated to ticker: {ticker.upper()}")
-        
-        self.channel_manager.update_user_activity(str(interaction.user.id))
-        print(f"  User activity updated")
+        logger.debug("State updated to ticker: %s", ticker)
         
         bot = interaction.client
         if hasattr(bot, 'get_ticker_embed'):
-            print(f"  Calling bot.get_ticker_embed({ticker})")
-            embed = await bot.get_ticker_embed(ticker)
+            embed = await self._cached_embed('ticker', ticker, lambda: bot.get_ticker_embed(ticker))
         else:
-            print(f"  Bot doesn't have get_ticker_embed - using fallback")
+            logger.debug("Bot doesn't have get_ticker_embed - using fallback")
             embed = discord.Embed(title=f"{ticker.upper()} Analysis", color=0x00aaff)
         
-        from discord_dashboard import TickerView
-        print(f"  Creating TickerView for {ticker}")
-        view = TickerView(bot, ticker)
+        view = TickerView(bot, ticker) if TickerView else discord.utils.MISSING
         
-        print(f"  Sending response: edit message")
+        logger.debug("Sending response: edit message")
         await interaction.response.edit_message(embed=embed, view=view)
-        print(f"  Response sent successfully")
+        logger.debug("Response sent successfully")
     
     @log_button_press
     async def handle_add_to_watchlist(self, interaction: discord.Interaction, ticker: str):
         """Add ticker to user's watchlist"""
-        print(f"[FUNCTION] handle_add_to_watchlist called")
-        print(f"  Ticker: {ticker}")
-        print(f"  User: {interaction.user}")
-        print(f"  User ID: {interaction.user.id}")
+        logger.debug("Ticker: %s", ticker)
+        logger.debug("User ID: %s", interaction.user.id)
         
         user_id = str(interaction.user.id)
-        print(f"  Checking if already in watchlist...")
+        logger.debug("Checking if already in watchlist...")
         success = self.channel_manager.add_to_watchlist(user_id, ticker)
         
-        print(f"  Add to watchlist result: {success}")
+        logger.debug("Add to watchlist result: %s", success)
         
         if success:
-            print(f"  Creating success embed")
+            logger.debug("Creating success embed")
             embed = discord.Embed(
                 title="Added to Watchlist",
                 description=f"**{ticker.upper()}** has been added",
                 color=0x00ff00
             )
         else:
-            print(f"  Creating already exists embed")
+            logger.debug("Creating already exists embed")
             embed = discord.Embed(
                 title="Already in Watchlist",
                 description=f"**{ticker.upper()}** is already there",
                 color=0xffaa00
             )
         
-        print(f"  Sending ephemeral response")
+        logger.debug("Sending ephemeral response")
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        print(f"  Response sent successfully")
+        logger.debug("Response sent successfully")
     
     @log_button_press
     async def handle_remove_from_watchlist(self, interaction: discord.Interaction, 
                                            ticker: str, user_id: str):
         """Remove ticker from watchlist"""
-        print(f"[FUNCTION] handle_remove_from_watchlist called")
-        print(f"  Ticker: {ticker}")
-        print(f"  User ID: {user_id}")
-        print(f"  User: {interaction.user}")
+        logger.debug("Ticker: %s", ticker)
+        logger.debug("User ID: %s", user_id)
         
         success = self.channel_manager.remove_from_watchlist(user_id, ticker)
-        print(f"  Remove result: {success}")
+        logger.debug("Remove result: %s", success)
         
         if success:
-            print(f"  Creating success embed")
-            embed = discord.Embed(title="Removed", color=0x00ff00)
+            logger.debug("Creating success embed")
+            embed = self._removed
         else:
-            print(f"  Creating not found embed")
-            embed = discord.Embed(title="Not Found", color=0xffaa00)
+            logger.debug("Creating not found embed")
+            embed = self._not_found
         
-        print(f"  Sending ephemeral response")
+        logger.debug("Sending ephemeral response")
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        print(f"  Response sent successfully")
+        logger.debug("Response sent successfully")
     
     @log_button_press
     async def handle_toggle_autorefresh(self, interaction: discord.Interaction):
         """Toggle auto-refresh on/off"""
-        print(f"[FUNCTION] handle_toggle_autorefresh called")
-        print(f"  User: {interaction.user}")
-        print(f"  Channel: {interaction.channel}")
+        logger.debug("Channel: %s", interaction.channel)
         
         channel_id = str(interaction.channel_id)
         state = self.channel_manager.get_channel_state(channel_id)
-        print(f"  Current auto_refresh: {state.get('auto_refresh', True)}")
+        logger.debug("Current auto_refresh: %s", state.get('auto_refresh', True))
         
         new_auto = not state.get('auto_refresh', True)
-        print(f"  New auto_refresh: {new_auto}")
+        logger.debug("New auto_refresh: %s", new_auto)
         
         self.channel_manager.update_channel_state(channel_id, auto_refresh=new_auto)
-        print(f"  State updated")
+        self.invalidate_embeds('settings')
+        logger.debug("State updated")
         
-        status = "enabled" if new_auto else "disabled"
-        print(f"  Creating status embed")
-        embed = discord.Embed(
-            title=f"Auto-Refresh {status}",
-            color=0x00ff00 if new_auto else 0xffaa00
-        )
+        embed = self._autorefresh_on if new_auto else self._autorefresh_off
         
-        print(f"  Sending ephemeral response")
+        logger.debug("Sending ephemeral response")
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        print(f"  Response sent successfully")
+        logger.debug("Response sent successfully")
+    
+    def _render_report(self, ticker: str, report_type: str):
+        """Render a report on the report worker thread
+        
+        Returns:
+            Tuple of (report file path or None, page count, file size in bytes)
+        """
+        if report_type == 'comprehensive':
+            report_file = self.report_generator.generate_comprehensive_report(ticker)
+        else:
+            report_file = self.report_generator.generate_quick_report(ticker)
+        file_size = os.path.getsize(report_file) if report_file else 0
+        return report_file, self.report_generator.page_count, file_size
     
     @log_button_press
     async def handle_generate_ticker_report(self, interaction: discord.Interaction, 
                                            ticker: str, report_type: str = 'comprehensive'):
         """Generate report for a ticker"""
-        print(f"[FUNCTION] handle_generate_ticker_report called")
-        print(f"  Ticker: {ticker}")
-        print(f"  Report Type: {report_type}")
-        print(f"  User: {interaction.user}")
+        logger.debug("Ticker: %s", ticker)
+        logger.debug("Report Type: %s", report_type)
         
-        print(f"  Deferring response (ephemeral)")
+        logger.debug("Deferring response (ephemeral)")
         await interaction.response.defer(ephemeral=True)
         
+        if self.report_generator is None:
+            await interaction.followup.send("Report generation is unavailable", ephemeral=True)
+            return
+        
         try:
-            print(f"  Importing TickerReportGenerator")
-            from ticker_report import TickerReportGenerator
-            generator = TickerReportGenerator(self.db)
-            
-            if report_type == 'comprehensive':
-                print(f"  Generating comprehensive report for {ticker}")
-                report_file = generator.generate_comprehensive_report(ticker)
-            else:
-                print(f"  Generating quick report for {ticker}")
-                report_file = generator.generate_quick_report(ticker)
+            logger.debug("Generating %s report for %s", report_type, ticker)
+            loop = asyncio.get_running_loop()
+            report_file, page_count, file_size = await loop.run_in_executor(
+                self._report_pool, self._render_report, ticker, report_type
+            )
             
-            print(f"  Report file: {report_file}")
+            logger.debug("Report file: %s", report_file)
             
             if report_file:
-                import os
-                file_size = os.path.getsize(report_file)
-                print(f"  File size: {file_size} bytes")
+                logger.debug("File size: %s bytes", file_size)
                 
-                print(f"  Saving report to database...")
+                logger.debug("Saving report to database...")
                 self.channel_manager.save_report(
                     report_type=report_type, ticker=ticker,
                     user_id=str(interaction.user.id), channel_id=str(interaction.channel_id),
-                    file_path=report_file, pages=generator.page_count, file_size=file_size
+                    file_path=report_file, pages=page_count, file_size=file_size
                 )
-                print(f"  Report saved")
+                logger.debug("Report saved")
                 
-                print(f"  Sending report file")
-                await interaction.followup.send(
-                    f"**{ticker} Report**", file=discord.File(report_file), ephemeral=True
-                )
-                print(f"  Report sent successfully")
+                logger.debug("Sending report file")
+                with open(report_file, 'rb') as fh:
+                    await interaction.followup.send(
+                        f"**{ticker} Report**",
+                        file=discord.File(fh, filename=os.path.basename(report_file)),
+                        ephemeral=True
+                    )
+                logger.debug("Report sent successfully")
             else:
-                print(f"  Report generation returned None")
+                logger.debug("Report generation returned None")
                 await interaction.followup.send(f"Could not generate report for {ticker}", ephemeral=True)
         except Exception as e:
-            print(f"\n{'='*70}")
-            print(f"[ERROR] Report generation failed!")
-            print(f"  Error: {e}")
-            print(f"  Traceback:\n{traceback.format_exc()}")
-            print(f"{'='*70}\n")
+            logger.exception("Report generation failed")
             await interaction.followup.send(f"Error: {str(e)}", ephemeral=True)
     
     @log_button_press
     async def show_top_movers(self, interaction: discord.Interaction, direction: str = 'gainers'):
         """Show top gainers or losers"""
-        print(f"[FUNCTION] show_top_movers called")
-        print(f"  Direction: {direction}")
-        print(f"  User: {interaction.user}")
-        
-        conn = self.db.get_connection()
-        c = conn.cursor()
+        logger.debug("Direction: %s", direction)
         
         try:
-            if direction == 'gainers':
-                print(f"  Querying top gainers...")
-                c.execute('''SELECT ticker, price_change_pct, current_price
-                             FROM stock_tracking WHERE status = "tracking"
-                             ORDER BY price_change_pct DESC LIMIT 10''')
-                title = "Top Gainers"
-            else:
-                print(f"  Querying top losers...")
-                c.execute('''SELECT ticker, price_change_pct, current_price
-                             FROM stock_tracking WHERE status = "tracking"
-                             ORDER BY price_change_pct ASC LIMIT 10''')
-                title = "Top Losers"
-            
-            results = c.fetchall()
-            print(f"  Query returned {len(results)} results")
+            results = await asyncio.to_thread(_fetch_movers, self.db, direction)
+            logger.debug("Query returned %s results", len(results))
             
+            title = "Top Gainers" if direction == 'gainers' else "Top Losers"
             embed = discord.Embed(title=title, color=0x00ff00 if direction == 'gainers' else 0xff0000)
             
             for i, (ticker, change, price) in enumerate(results[:10], 1):
-                print(f"  {i}. {ticker}: {change:+.2f}% @ ${price:.2f}")
                 embed.add_field(name=f"{i}. {ticker}", value=f"{change:+.2f}% @ ${price:.2f}", inline=True)
             
-            print(f"  Sending ephemeral response")
+            logger.debug("Sending ephemeral response")
             await interaction.response.send_message(embed=embed, ephemeral=True)
-            print(f"  Response sent successfully")
-        except Exception as e:
-            print(f"\n{'='*70}")
-            print(f"[ERROR] show_top_movers failed!")
-            print(f"  Error: {e}")
-            print(f"  Traceback:\n{traceback.format_exc()}")
-            print(f"{'='*70}\n")
+            logger.debug("Response sent successfully")
+        except Exception:
+            logger.exception("show_top_movers failed")
             await interaction.response.send_message("Error loading data", ephemeral=True)
-        finally:
-            conn.close()
-            print(f"  Database connection closed")
     
     @log_button_press
     async def show_recent_alerts(self, interaction: discord.Interaction):
         """Show recent alerts"""
-        print(f"[FUNCTION] show_recent_alerts called")
-        print(f"  User: {interaction.user}")
-        
-        conn = self
\ No newline at end of file
+        try:
+            results = await asyncio.to_thread(_fetch_recent_alerts, self.db)
+            logger.debug("Query returned %s results", len(results))
+            
+            embed = discord.Embed(title="Recent Alerts", color=0xffaa00)
+            if not results:
+                embed.description = "No alerts yet"
+            
+            for ticker, alert_type, confidence, alert_date in results:
+                embed.add_field(
+                    name=f"{ticker} - {alert_type}",
+                    value=f"Confidence: {(confidence or 0):.0%}\n{str(alert_date)[:16]}",
+                    inline=True
+                )
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except Exception:
+            logger.exception("show_recent_alerts failed")
+            await interaction.response.send_message("Error loading data", ephemeral=True)
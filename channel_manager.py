@@ -18,6 +18,10 @@ class ChannelManager:
         self.bot = bot
         self.db = db
         self._channel_cache: Dict[str, discord.TextChannel] = {}
+        # channel_id -> state dict mirroring dashboard_state; entries are replaced,
+        # never mutated, so readers can use them without a lock or a query
+        self._state_cache: Dict[str, Dict[str, Any]] = {}
+        self._load_state_cache()
     
     async def find_or_create_dashboard_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
         """
@@ -67,63 +71,67 @@ class ChannelManager:
         c = conn.cursor()
         
         try:
+            now = datetime.now().isoformat()
             c.execute('''INSERT OR REPLACE INTO dashboard_state 
                          (channel_id, current_view, refresh_interval, auto_refresh, last_refresh)
                          VALUES (?, ?, ?, ?, ?)''',
-                     (str(channel_id), 'overview', DASHBOARD_REFRESH_INTERVAL, True, datetime.now().isoformat()))
+                     (str(channel_id), 'overview', DASHBOARD_REFRESH_INTERVAL, True, now))
             conn.commit()
+            self._state_cache[str(channel_id)] = {**self._get_default_state(), 'last_refresh': now}
         except Exception as e:
             print(f"[ERROR] Failed to initialize channel state: {e}")
         finally:
             conn.close()
     
-    def get_channel_state(self, channel_id: str) -> Dict[str, Any]:
-        """
-        Get current dashboard state for a channel
-        
-        Args:
-            channel_id: Discord channel ID
-            
-        Returns:
-            Dictionary with channel state
-        """
+    def _load_state_cache(self):
+        """Load every channel's dashboard state into the in-memory cache"""
         conn = self.db.get_connection()
         c = conn.cursor()
         
         try:
-            c.execute('''SELECT current_view, current_ticker, refresh_interval, 
+            c.execute('''SELECT channel_id, current_view, current_ticker, refresh_interval, 
                                auto_refresh, last_refresh, pinned_message_id
-                         FROM dashboard_state 
-                         WHERE channel_id = ?''', (str(channel_id),))
-            
-            row = c.fetchone()
+                         FROM dashboard_state''')
             
-            if row:
-                return {
-                    'current_view': row[0],
-                    'current_ticker': row[1],
-                    'refresh_interval': row[2],
-                    'auto_refresh': bool(row[3]),
-                    'last_refresh': row[4],
-                    'pinned_message_id': row[5]
-                }
-            else:
-                # Return default state
-                return {
-                    'current_view': 'overview',
-                    'current_ticker': None,
-                    'refresh_interval': DASHBOARD_REFRESH_INTERVAL,
-                    'auto_refresh': True,
-                    'last_refresh': None,
-                    'pinned_message_id': None
+            self._state_cache = {
+                str(row[0]): {
+                    'current_view': row[1],
+                    'current_ticker': row[2],
+                    'refresh_interval': row[3],
+                    'auto_refresh': bool(row[4]),
+                    'last_refresh': row[5],
+                    'pinned_message_id': row[6]
                 }
+                for row in c.fetchall()
+            }
                 
         except Exception as e:
-            print(f"[ERROR] Failed to get channel state: {e}")
-            return self._get_default_state()
+            print(f"[ERROR] Failed to load channel states: {e}")
         finally:
             conn.close()
     
+    def get_channel_state(self, channel_id: str) -> Dict[str, Any]:
+        """
+        Get current dashboard state for a channel
+        
+        Args:
+            channel_id: Discord channel ID
+            
+        Returns:
+            Dictionary with channel state (shared; do not modify)
+        """
+        state = self._state_cache.get(str(channel_id))
+        return state if state is not None else self._get_default_state()
+    
+    def _cache_state_update(self, channel_id: str, updates: Dict[str, Any]):
+        """Swap in a new cached state for a channel whose row was just updated"""
+        channel_id = str(channel_id)
+        state = self._state_cache.get(channel_id)
+        if state is not None:
+            if 'auto_refresh' in updates:
+                updates = {**updates, 'auto_refresh': bool(updates['auto_refresh'])}
+            self._state_cache[channel_id] = {**state, **updates}
+    
     def update_channel_state(self, channel_id: str, **kwargs):
         """
         Update dashboard state for a channel
@@ -141,10 +149,13 @@ class ChannelManager:
                 set_clause = ', '.join([f"{k} = ?" for k in kwargs.keys()])
                 values = list(kwargs.values())
                 
+                now = datetime.now().isoformat()
+                
                 c.execute(f'''UPDATE dashboard_state 
                              SET {set_clause}, last_refresh = ?
-                             WHERE channel_id = ?''', values + [datetime.now().isoformat(), str(channel_id)])
+                             WHERE channel_id = ?''', values + [now, str(channel_id)])
                 conn.commit()
+                self._cache_state_update(channel_id, {**kwargs, 'last_refresh': now})
                 
         except Exception as e:
             print(f"[ERROR] Failed to update channel state: {e}")
@@ -214,6 +225,37 @@ class ChannelManager:
         finally:
             conn.close()
     
+    def record_interaction(self, channel_id: str, user_id: str, **kwargs):
+        """
+        Update a channel's dashboard state and the user's activity in one transaction
+        
+        Args:
+            channel_id: Discord channel ID
+            user_id: Discord user ID of the user who pressed the button
+            **kwargs: State fields to update (current_view, current_ticker, etc.)
+        """
+        conn = self.db.get_connection()
+        c = conn.cursor()
+        
+        try:
+            now = datetime.now().isoformat()
+            if kwargs:
+                set_clause = ', '.join([f"{k} = ?" for k in kwargs.keys()])
+                c.execute(f'''UPDATE dashboard_state 
+                             SET {set_clause}, last_refresh = ?
+                             WHERE channel_id = ?''', list(kwargs.values()) + [now, str(channel_id)])
+            c.execute('''UPDATE dashboard_users 
+                         SET last_active = ? 
+                         WHERE user_id = ?''', (now, str(user_id)))
+            conn.commit()
+            if kwargs:
+                self._cache_state_update(channel_id, {**kwargs, 'last_refresh': now})
+            
+        except Exception as e:
+            print(f"[ERROR] Failed to record interaction: {e}")
+        finally:
+            conn.close()
+    
     def get_user_watchlist(self, user_id: str) -> list:
         """
         Get user's watchlist tickers
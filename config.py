@@ -179,7 +179,8 @@ ALERT_TRACKED_STOCKS_LIMIT = 50
 STOCK_CONFIG = {
     'default_stocks': ['SPY', 'QQQ', 'IWM', 'GLD', 'TLT', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'AMD', 'NFLX', 'DIS', 'V', 'JPM', 'BAC', 'XOM', 'CVX'],
     'max_tracking_age_days': 7,
-    'min_mention_count': 2
+    'min_mention_count': 2,
+    'max_concurrent': 32  # Max tickers AlertManager checks at once
 }
 
 # Technical Indicators
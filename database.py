@@ -3,9 +3,13 @@ Database operations and queries
 FIXED: Database locking issues with timeout and WAL mode
 """
 
+import json
+import queue
 import sqlite3
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from config import DB_PATH
 from database_init import DatabaseInitializer
 
@@ -17,13 +21,40 @@ class DatabaseManager:
         self.db_path = db_path
         self.initializer = DatabaseInitializer(db_path)
         self.initializer.init_database()
+        self._read_pool: queue.Queue = queue.Queue(maxsize=4)
     
     def get_connection(self) -> sqlite3.Connection:
         """Get database connection with timeout to prevent locking"""
         conn = sqlite3.connect(self.db_path, timeout=30.0)
         conn.execute("PRAGMA journal_mode=WAL")  # Enable Write-Ahead Logging
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL only needs to sync at checkpoints
         return conn
     
+    @contextmanager
+    def read_connection(self):
+        """Borrow a pooled read-only connection for periodic queries
+        
+        Connections are opened lazily and kept open between uses so
+        frequent readers (e.g. dashboard refreshes) skip connection setup.
+        """
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")
+        try:
+            yield conn
+        finally:
+            # End any implicit read transaction so the reader sees fresh data
+            conn.rollback()
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
     def is_post_already_sent(self, post_id: str) -> bool:
         """Check if post was already sent to Discord"""
         conn = self.get_connection()
@@ -795,3 +826,74 @@ class DatabaseManager:
             print(f"[DB] Error saving invalid ticker: {e}")
         finally:
             conn.close()
+
+    # =========================================================================
+    # RESPONSE CACHE
+    # =========================================================================
+
+    def get_cached_response(self, key: str):
+        """Return the cached value for key, or None if missing or expired"""
+        conn = self.get_connection()
+        c = conn.cursor()
+        try:
+            c.execute("SELECT value FROM response_cache WHERE cache_key = ? AND expires_at > ?",
+                      (key, time.time()))
+            row = c.fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"[DB] Error reading response cache: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def get_cached_responses(self, keys: List[str]) -> Dict[str, Tuple[object, float]]:
+        """Return {key: (value, expires_at)} for the keys that are cached and unexpired"""
+        if not keys:
+            return {}
+        conn = self.get_connection()
+        c = conn.cursor()
+        try:
+            placeholders = ','.join('?' * len(keys))
+            c.execute(f"SELECT cache_key, value, expires_at FROM response_cache "
+                      f"WHERE cache_key IN ({placeholders}) AND expires_at > ?",
+                      (*keys, time.time()))
+            return {key: (json.loads(value), expires_at) for key, value, expires_at in c.fetchall()}
+        except Exception as e:
+            print(f"[DB] Error reading response cache: {e}")
+            return {}
+        finally:
+            conn.close()
+
+    def set_cached_responses(self, values: Dict[str, object], expire: float):
+        """Store several JSON-serialisable values for expire seconds in one transaction"""
+        if not values:
+            return
+        conn = self.get_connection()
+        c = conn.cursor()
+        try:
+            expires_at = time.time() + expire
+            c.executemany('''INSERT OR REPLACE INTO response_cache
+                             (cache_key, value, expires_at)
+                             VALUES (?, ?, ?)''',
+                          [(key, json.dumps(value, default=str), expires_at)
+                           for key, value in values.items()])
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error saving response cache: {e}")
+        finally:
+            conn.close()
+
+    def set_cached_response(self, key: str, value, expire: float):
+        """Store a JSON-serialisable value under key for expire seconds"""
+        conn = self.get_connection()
+        c = conn.cursor()
+        try:
+            c.execute('''INSERT OR REPLACE INTO response_cache
+                         (cache_key, value, expires_at)
+                         VALUES (?, ?, ?)''',
+                      (key, json.dumps(value, default=str), time.time() + expire))
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Error saving response cache: {e}")
+        finally:
+            conn.close()
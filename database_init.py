@@ -531,6 +531,12 @@ class DatabaseInitializer:
                       invalid_date TEXT,
                       reason TEXT)''')
 
+        # Response cache - fetched market data that should survive restarts
+        c.execute('''CREATE TABLE IF NOT EXISTS response_cache
+                     (cache_key TEXT PRIMARY KEY,
+                      value TEXT,
+                      expires_at REAL)''')
+
         # Create indexes
         c.execute('CREATE INDEX IF NOT EXISTS idx_ticker ON stock_tracking(ticker)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_post_date ON posted_submissions(posted_date)')
@@ -544,6 +550,10 @@ class DatabaseInitializer:
         c.execute('CREATE INDEX IF NOT EXISTS idx_sec_insider ON sec_insider_filings(ticker, transaction_date)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_economic_calendar ON economic_calendar(event_date)')
         c.execute('CREATE INDEX IF NOT EXISTS idx_ml_features ON ml_feature_store(ticker, date)')
+        # Covering index for the top-movers queries; supersedes idx_tracking_change
+        c.execute('DROP INDEX IF EXISTS idx_tracking_change')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_stock_tracking_movers ON stock_tracking(status, price_change_pct DESC, ticker, current_price)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_alert_log_date ON alert_log(alert_date DESC)')
         
         conn.commit()
         conn.close()
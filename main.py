@@ -6,6 +6,10 @@ Complete dashboard redesign with all new features + Slash Commands
 import asyncio
 import time
 import os
+import atexit
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import traceback
 import warnings
 import discord
@@ -1938,7 +1942,30 @@ async def run_bot():
         print(f"[FATAL] {e}")
 
 
+def configure_logging():
+    """Route module loggers through a queue so handler I/O stays off the event loop"""
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
+    file_handler = RotatingFileHandler(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot.log'),
+        maxBytes=5 * 1024 * 1024, backupCount=3, encoding='utf-8'
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    
+    listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 def main():
+    configure_logging()
     asyncio.run(run_bot())
 
 
@@ -60,7 +60,9 @@ class RedditScraper:
                                 'selftext': selftext,
                                 'url': f"https://reddit.com{post_data.get('permalink', '')}",
                                 'subreddit': subreddit,
+                                'subreddit_norm': subreddit.casefold(),
                                 'flair': post_data.get('link_flair_text', ''),
+                                'flair_norm': (post_data.get('link_flair_text') or '').casefold(),
                                 'score': post_data.get('score', 0),
                                 'num_comments': post_data.get('num_comments', 0),
                                 'upvote_ratio': post_data.get('upvote_ratio', 0),
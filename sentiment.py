@@ -275,6 +275,29 @@ class SentimentAnalyzer:
         else:
             return self._analyze_comments_vader(cleaned)
 
+    def analyze_batch(self, texts: List[str]) -> List[float]:
+        """
+        Score many short texts (headlines, post titles) in one pass.
+
+        Returns:
+            List of compound scores (-1 to 1), one per input text. FinBERT
+            scores the whole list with batched forward passes.
+        """
+        cleaned = [self._clean_text(t or '') for t in texts]
+        scores = [0.0] * len(cleaned)
+        todo = [i for i, t in enumerate(cleaned) if t.strip()]
+        if not todo:
+            return scores
+
+        if self.use_finbert:
+            results = self._finbert_batch_score([cleaned[i] for i in todo])
+            for i, result in zip(todo, results):
+                scores[i] = result['compound']
+        else:
+            for i in todo:
+                scores[i] = self.vader.polarity_scores(cleaned[i])['compound']
+        return scores
+
     def _analyze_comments_finbert(self, cleaned_comments: List[str]) -> Dict:
         scores = self._finbert_batch_score(cleaned_comments)
 